@@ -0,0 +1,67 @@
+"""
+Benchmark of the overhead per cycle of a RepeatActivity.
+
+Every cycle runs a sequence of basic activities. The benchmark compares
+registering new simpy processes every cycle with running the sub processes
+again in their long lived processes (env.reuse_processes), e.g.::
+
+    python benchmarks/while_activity.py --cycles 5000 --activities 5
+"""
+import argparse
+import time
+
+import simpy
+
+import openclsim.model as model
+
+
+def run(cycles, activities, reuse_processes):
+    """Run the simulation and return the wall clock time in seconds."""
+    env = simpy.Environment()
+    env.reuse_processes = reuse_processes
+    registry = {}
+    sub_processes = [
+        model.BasicActivity(
+            env=env, name=f"activity {i}", registry=registry, duration=1
+        )
+        for i in range(activities)
+    ]
+    sequence = model.SequentialActivity(
+        env=env, name="sequence", registry=registry, sub_processes=sub_processes
+    )
+    repeat = model.RepeatActivity(
+        env=env,
+        name="repeat",
+        registry=registry,
+        sub_processes=[sequence],
+        repetitions=cycles,
+    )
+    model.register_processes([repeat])
+
+    start = time.perf_counter()
+    env.run()
+    elapsed = time.perf_counter() - start
+    assert env.now == cycles * activities
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--activities", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for reuse_processes in [False, True]:
+        elapsed = min(
+            run(args.cycles, args.activities, reuse_processes)
+            for _ in range(args.repeat)
+        )
+        print(
+            f"reuse_processes={reuse_processes!s:5}: "
+            f"{elapsed:.3f} s, {elapsed / args.cycles * 1e6:.1f} us per cycle"
+        )
+
+
+if __name__ == "__main__":
+    main()
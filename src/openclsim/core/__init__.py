@@ -1,30 +1,68 @@
 """Core of the simulation Package."""
 
 from .container import HasContainer, HasMultiContainer
-from .events_container import EventsContainer
+from .distance import (
+    DistanceCache,
+    DistanceMatrix,
+    compute_distance,
+    get_distance_cache,
+)
+from .event_journal import EventJournal
+from .events_container import EventsContainer, MultiEventsContainer
+from .id_table import IdTable, get_id_table
 from .identifiable import Identifiable
 from .locatable import Locatable
-from .log import Log, LogState
-from .movable import ContainerDependentMovable, Movable, MultiContainerDependentMovable
+from .log import Log, LogLevel, LogState, check_log_level
+from .log_sink import ArrowLogSink, LogSink, ParquetLogSink
+from .log_store import LogStore
+from .movable import (
+    ContainerDependentMovable,
+    Movable,
+    MultiContainerDependentMovable,
+    Routable,
+)
+from .network import RouteNetwork, get_route_network
 from .processor import LoadingFunction, Processor, UnloadingFunction
 from .resource import HasResource
 from .simpy_object import SimpyObject
+from .spatial_index import SpatialIndex, get_spatial_index
+from .trips import TripLog
 
 __all__ = [
     "basic",
     "HasContainer",
     "HasMultiContainer",
+    "DistanceCache",
+    "DistanceMatrix",
+    "compute_distance",
+    "get_distance_cache",
+    "EventJournal",
     "EventsContainer",
+    "MultiEventsContainer",
     "Identifiable",
+    "IdTable",
+    "get_id_table",
     "Locatable",
     "Log",
+    "LogLevel",
+    "check_log_level",
+    "LogSink",
+    "ArrowLogSink",
+    "ParquetLogSink",
     "LogState",
+    "LogStore",
     "Movable",
     "ContainerDependentMovable",
     "MultiContainerDependentMovable",
+    "Routable",
+    "RouteNetwork",
+    "get_route_network",
     "Processor",
     "LoadingFunction",
     "UnloadingFunction",
     "HasResource",
     "SimpyObject",
+    "SpatialIndex",
+    "get_spatial_index",
+    "TripLog",
 ]
@@ -1,5 +1,5 @@
 """Component that assigns a container to the simulation objects."""
-from .events_container import EventsContainer
+from .events_container import EventsContainer, MultiEventsContainer
 from .simpy_object import SimpyObject
 
 
@@ -14,22 +14,22 @@ class HasContainer(SimpyObject):
     level
         Amount the container holds initially (default 0)
     store_capacity
-        The number of different types of information can be stored. In this
-        class it usually is 1 (default).
+        Deprecated and ignored, see EventsContainer.
     """
 
+    container_class = EventsContainer
+
     def __init__(
         self,
         capacity: float,
-        store_capacity: int = 1,
+        store_capacity: int = None,
         level: float = 0.0,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         """Initialization"""
-        container_class = EventsContainer
-        self.container = container_class(self.env, store_capacity=store_capacity)
+        self.container = self.container_class(self.env, store_capacity=store_capacity)
         if capacity > 0:
             initials = [
                 {
@@ -54,29 +54,39 @@ class HasMultiContainer(HasContainer):
     A class which can represent information of objects of multiple types.
 
     store_capacity
-        The number of different types of information can be stored. In this
-        class it is usually >1.
+        Deprecated and ignored, see EventsContainer.
     initials
         a list of dictionaries describing the id_ of the container, the level of
         the individual container and the capacity of the individual container.
+
+    The container is a MultiEventsContainer, which keeps the levels in arrays
+    and offers bulk operations (e.g. get_levels, get_fill_degree, transfer).
     """
 
-    def __init__(self, initials, store_capacity=10, *args, **kwargs):
+    container_class = MultiEventsContainer
+
+    def __init__(self, initials, store_capacity=None, *args, **kwargs):
         super().__init__(capacity=0, store_capacity=store_capacity, *args, **kwargs)
         self.container.initialize_container(initials)
+        # levels of the last get_state call, reused while the levels are unchanged
+        self._container_levels = (None, None)
 
     def get_state(self):
         state = {}
         if hasattr(super(), "get_state"):
             state = super().get_state()
 
-        state.update(
-            {
-                "container level": {
-                    container: self.container.get_level(id_=container)
-                    for container in self.container.container_list
-                }
-            }
-        )
+        version, levels = self._container_levels
+        if version != self.container._version:
+            levels = dict(
+                zip(
+                    self.container.container_list,
+                    self.container._level_values(),
+                )
+            )
+            self._container_levels = (self.container._version, levels)
+
+        # a copy, so the logged states do not share the cached dictionary
+        state.update({"container level": dict(levels)})
 
         return state
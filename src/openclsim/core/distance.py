@@ -0,0 +1,272 @@
+"""Great circle distances between the simulation objects."""
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pyproj
+import shapely.geometry
+
+# we only have one earth, defined here.
+WGS84 = pyproj.Geod(ellps="WGS84")
+# mean radius of the earth (m), for the spherical approximations
+EARTH_RADIUS = 6371008.8
+
+DistanceCacheInfo = namedtuple(
+    "DistanceCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+def _point(geometry):
+    """Return geometry as shapely geometry (without a copy if it is a Point)."""
+    if isinstance(geometry, shapely.geometry.Point):
+        return geometry
+    return shapely.geometry.shape(geometry)
+
+
+def geodesic(lon1, lat1, lon2, lat2):
+    """Return the distance (m) on the WGS84 ellipsoid (exact), vectorized."""
+    if np.ndim(lon1) and np.size(lon1) == 1:
+        # pyproj converts arrays of a single point to scalars (deprecated)
+        coordinates = [np.ravel(value)[0].item() for value in (lon1, lat1, lon2, lat2)]
+        _, _, distance = WGS84.inv(*coordinates)
+        return np.full(np.shape(lon1), distance)
+    _, _, distance = WGS84.inv(lon1, lat1, lon2, lat2)
+    return distance
+
+
+def haversine(lon1, lat1, lon2, lat2):
+    """Return the distance (m) on a sphere with the haversine formula, vectorized."""
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def equirectangular(lon1, lat1, lon2, lat2):
+    """
+    Return the distance (m) with the equirectangular approximation, vectorized.
+
+    The approximation is fast and accurate for short distances only.
+    """
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    x = (lon2 - lon1) * np.cos((lat1 + lat2) / 2)
+    return EARTH_RADIUS * np.hypot(x, lat2 - lat1)
+
+
+# the distance backends, selected with the distance_method of the environment
+DISTANCE_METHODS = {
+    "geodesic": geodesic,
+    "haversine": haversine,
+    "equirectangular": equirectangular,
+}
+
+
+def _get_method(method):
+    assert method in DISTANCE_METHODS, (
+        f"Chosen distance method ({method}) is not supported please choose "
+        f"from: {', '.join(DISTANCE_METHODS)}"
+    )
+    return DISTANCE_METHODS[method]
+
+
+def compute_distance(origin, destination, cache=None, method="geodesic"):
+    """
+    Return the great circle distance (m) from origin to destination.
+
+    Parameters
+    ----------
+    origin
+        point geometry (shapely or geojson), in wgs84 lon, lat
+    destination
+        point geometry (shapely or geojson), in wgs84 lon, lat
+    cache
+        DistanceCache to look up and store the distance, not cached if None
+        (the method of the cache is used)
+    method
+        the distance backend, see DISTANCE_METHODS
+    """
+    if cache is not None:
+        return cache.distance(origin, destination)
+    orig = _point(origin)
+    dest = _point(destination)
+    return float(_get_method(method)(orig.x, orig.y, dest.x, dest.y))
+
+
+class DistanceMatrix:
+    """
+    Precomputed great circle distances between a fixed set of locations.
+
+    The full matrix is computed with a single vectorized call of the Geod,
+    after which the distance between two of the locations is a table lookup.
+    The matrix can be saved to disk and reused, e.g. across ensemble runs
+    with the same sites. It is used by the DistanceCache of an environment
+    when it is set as the ``distance_matrix`` attribute of the environment
+    (or as the matrix of the cache).
+
+    Parameters
+    ----------
+    coordinates
+        array (n, 2) with the lon, lat of the locations
+    distances
+        array (n, n) with the distance (m) from location i to location j,
+        computed if None
+    method
+        the distance backend, see DISTANCE_METHODS
+    """
+
+    def __init__(self, coordinates, distances=None, method="geodesic"):
+        self.method = method
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        if distances is None:
+            lon, lat = self.coordinates[:, 0], self.coordinates[:, 1]
+            n = len(self.coordinates)
+            distances = _get_method(method)(
+                np.repeat(lon, n), np.repeat(lat, n), np.tile(lon, n), np.tile(lat, n)
+            )
+        self.distances = np.asarray(distances, dtype=np.float64).reshape(
+            len(self.coordinates), len(self.coordinates)
+        )
+        self._index = {
+            coordinate: i
+            for i, coordinate in enumerate(map(tuple, self.coordinates.tolist()))
+        }
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    @classmethod
+    def from_locatables(cls, locatables, method="geodesic"):
+        """Compute the matrix of the (point) geometries of the Locatables."""
+        points = [_point(locatable.geometry) for locatable in locatables]
+        coordinates = list(dict.fromkeys((point.x, point.y) for point in points))
+        return cls(coordinates, method=method)
+
+    def get(self, origin, destination):
+        """Return the distance between two points, None if one is not known."""
+        i = self._index.get(origin)
+        j = self._index.get(destination)
+        if i is None or j is None:
+            return None
+        return self.distances[i, j].item()
+
+    def distance(self, origin, destination):
+        """Return the distance (m) from origin to destination (geometries)."""
+        orig = _point(origin)
+        dest = _point(destination)
+        distance = self.get((orig.x, orig.y), (dest.x, dest.y))
+        if distance is None:
+            raise KeyError(f"{orig.wkt} or {dest.wkt} is not in the distance matrix")
+        return distance
+
+    def save(self, path):
+        """Save the matrix to a numpy .npz file."""
+        np.savez(
+            path,
+            coordinates=self.coordinates,
+            distances=self.distances,
+            method=self.method,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a matrix that was saved with save."""
+        with np.load(path) as data:
+            return cls(data["coordinates"], data["distances"], str(data["method"]))
+
+
+class DistanceCache:
+    """
+    Bounded least recently used (LRU) cache of great circle distances.
+
+    The distances are keyed on the coordinates of the origin and destination,
+    so the cache can be shared by all objects of an environment (see
+    get_distance_cache). In cyclic simulations the same pairs of sites repeat
+    many times, so most distances are looked up instead of computed.
+
+    Parameters
+    ----------
+    maxsize
+        maximum number of cached distances, the least recently used distance
+        is removed when the cache is full. Unbounded if None, no distances are
+        cached if 0.
+    matrix
+        optional DistanceMatrix, the distances between its locations are read
+        from the matrix (and counted as hits) instead of cached
+    method
+        the distance backend, see DISTANCE_METHODS
+    """
+
+    def __init__(self, maxsize=4096, matrix=None, method="geodesic"):
+        assert (
+            matrix is None or matrix.method == method
+        ), "The distance matrix is computed with another method"
+        self.maxsize = maxsize
+        self.matrix = matrix
+        self.method = method
+        self._compute = _get_method(method)
+        self.hits = 0
+        self.misses = 0
+        self._distances: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._distances)
+
+    def distance(self, origin, destination):
+        """Return the great circle distance (m) from origin to destination."""
+        orig = _point(origin)
+        dest = _point(destination)
+        key = (orig.x, orig.y, dest.x, dest.y)
+
+        if self.matrix is not None:
+            distance = self.matrix.get(key[:2], key[2:])
+            if distance is not None:
+                self.hits += 1
+                return distance
+
+        distance = self._distances.get(key)
+        if distance is not None:
+            self.hits += 1
+            self._distances.move_to_end(key)
+            return distance
+
+        self.misses += 1
+        distance = float(self._compute(*key))
+        if self.maxsize is None or self.maxsize > 0:
+            self._distances[key] = distance
+            if self.maxsize is not None and len(self._distances) > self.maxsize:
+                self._distances.popitem(last=False)
+        return distance
+
+    def cache_info(self):
+        """Return the hit and miss statistics, like functools.lru_cache."""
+        return DistanceCacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._distances)
+        )
+
+    def clear(self):
+        """Remove all distances and reset the statistics."""
+        self._distances.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def get_distance_cache(env):
+    """
+    Return the DistanceCache of the environment, it is created on first use.
+
+    The size of the cache can be set with the ``distance_cache_size``
+    attribute of the environment, a precomputed DistanceMatrix with the
+    ``distance_matrix`` attribute and the distance backend with the
+    ``distance_method`` attribute (e.g. "haversine" to choose speed over the
+    exact distance on the ellipsoid).
+    """
+    cache = getattr(env, "distance_cache", None)
+    if cache is None:
+        cache = DistanceCache(
+            maxsize=getattr(env, "distance_cache_size", 4096),
+            matrix=getattr(env, "distance_matrix", None),
+            method=getattr(env, "distance_method", "geodesic"),
+        )
+        env.distance_cache = cache
+    return cache
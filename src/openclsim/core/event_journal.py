@@ -0,0 +1,190 @@
+"""Environment wide journal with the log entries of all simulation objects."""
+import numpy as np
+import pandas as pd
+
+from .id_table import get_id_table
+from .log_store import LogStore, _grow
+
+
+class EventJournal:
+    """
+    Single columnar table with the log entries of all Log objects.
+
+    A journal is enabled per environment by setting it as the
+    ``event_journal`` attribute of the simpy environment, before the
+    simulation objects are created. All Log objects in that environment then
+    append their entries to the LogStore of the journal, with an extra column
+    holding the index of the object. As the entries are appended while the
+    simulation runs, the journal is (nearly) in time order: only entries that
+    are logged with a timestamp in the past (e.g. the start of a shift that is
+    logged when it ends) have to be moved.
+
+    The log of a single object is a view on the rows of that object, so
+    analyses over several objects (e.g. BaseCP.combine_logs) can use the
+    journal directly instead of concatenating and sorting the object logs.
+
+    The journal records the complete ObjectState of every entry, delta
+    encoding of the state (state_logging="delta") is not supported. The
+    activity ids are coded with the IdTable of the environment.
+    """
+
+    def __init__(self):
+        self.store = LogStore()
+        # the Log objects, the index in this list is their code in the journal
+        self.objects: list = []
+        self._object_codes = np.empty(64, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.store)
+
+    def add_object(self, log):
+        """Add a Log object to the journal and return the view on its entries."""
+        if not self.objects:
+            self.store.id_table = get_id_table(log.env)
+        self.objects.append(log)
+        return JournalView(self, len(self.objects) - 1)
+
+    def _add_row(self, row, index):
+        self._object_codes = _grow(self._object_codes, row + 1)
+        self._object_codes[row] = index
+
+    @property
+    def object_codes(self):
+        """Return the index (in objects) of the object of every entry."""
+        return self._object_codes[: len(self.store)]
+
+    def contains(self, objects):
+        """Return True if all given objects log to this journal."""
+        return all(
+            isinstance(getattr(obj, "_log_store", None), JournalView)
+            and obj._log_store.journal is self
+            for obj in objects
+        )
+
+    def get_dataframe(self, objects=None):
+        """
+        Get the entries of the journal in a pandas dataframe, in time order.
+
+        The dataframe has the columns Object (the name of the object),
+        Timestamp, ActivityID and ActivityState.
+
+        Parameters
+        ----------
+        objects
+            the Log objects to include, all objects if None
+        """
+        assert (
+            not self.store.has_records
+        ), "The journal contains entries which are not in the openclsim format"
+
+        rows = np.arange(len(self.store))
+        codes = self.object_codes
+        if objects is not None:
+            assert self.contains(objects), "Not all objects log to this journal"
+            indices = [obj._log_store.index for obj in objects]
+            rows = rows[np.isin(codes, indices)]
+
+        timestamps = self.store.timestamps[rows]
+        if np.any(np.diff(timestamps) < 0):
+            # entries which are logged with a timestamp in the past
+            rows = rows[np.argsort(timestamps, kind="stable")]
+
+        names = np.empty(len(self.objects), dtype=object)
+        names[:] = [getattr(obj, "name", None) for obj in self.objects]
+        return pd.DataFrame(
+            {
+                "Object": names[codes[rows]],
+                "Timestamp": self.store.get_datetimes(rows=rows).astype(
+                    "datetime64[ns]"
+                ),
+                "ActivityID": self.store.get_activity_ids(rows=rows),
+                "ActivityState": self.store.get_activity_states(rows=rows),
+            }
+        )
+
+
+class JournalView:
+    """
+    View on the entries of a single object in an EventJournal.
+
+    The view has the same interface as a LogStore, so it can be used as the
+    store of a Log object. Only the row numbers of the entries are kept in
+    the view, the entries themselves are stored in the journal.
+    """
+
+    delta_state = False
+
+    def __init__(self, journal, index):
+        self.journal = journal
+        self.index = index
+        self._size = 0
+        self._rows = np.empty(16, dtype=np.int64)
+        self._nr_records = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def id_table(self):
+        return self.journal.store.id_table
+
+    @property
+    def rows(self):
+        """Return the rows of the entries of the object in the journal."""
+        return self._rows[: self._size]
+
+    def _add_row(self, row):
+        self.journal._add_row(row, self.index)
+        self._rows = _grow(self._rows, self._size + 1)
+        self._rows[self._size] = row
+        self._size += 1
+        return self._size - 1
+
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        """Append an openclsim log entry, see LogStore.append."""
+        row = self.journal.store.append(
+            t, activity_id, activity_state, object_state, activity_label
+        )
+        return self._add_row(row)
+
+    def append_record(self, record):
+        """Append a record which is stored as is, see LogStore.append_record."""
+        self._nr_records += 1
+        return self._add_row(self.journal.store.append_record(record))
+
+    @property
+    def has_records(self):
+        """Return True if the object has entries in another format."""
+        return self._nr_records > 0
+
+    @property
+    def timestamps(self):
+        """Return the timestamps as an array of floats (seconds since 1970)."""
+        return self.journal.store.timestamps[self.rows]
+
+    def get_datetimes(self, start=0):
+        return self.journal.store.get_datetimes(rows=self.rows[start:])
+
+    def get_activity_codes(self, start=0):
+        return self.journal.store.get_activity_codes(rows=self.rows[start:])
+
+    def get_activity_ids(self, start=0):
+        return self.journal.store.get_activity_ids(rows=self.rows[start:])
+
+    def get_activity_states(self, start=0):
+        return self.journal.store.get_activity_states(rows=self.rows[start:])
+
+    def get_activity_labels(self, start=0):
+        return self.journal.store.get_activity_labels(rows=self.rows[start:])
+
+    def get_object_states(self, start=0):
+        return self.journal.store.get_object_states(rows=self.rows[start:])
+
+    def get_object_state(self, row):
+        return self.journal.store.get_object_state(self._rows[row])
+
+    def get_record(self, row):
+        return self.journal.store.get_record(self._rows[row])
+
+    def get_records(self):
+        return self.journal.store.get_records(rows=self.rows)
@@ -1,26 +1,80 @@
 """EventsContainer provides events based on the level of the container."""
-import operator as py_opp
 
-import simpy
+import math
+import warnings
+from bisect import bisect_left, bisect_right, insort
 
+import numpy as np
 
-class EventsContainer(simpy.FilterStore):
+
+def _is_integral(amounts):
+    """Return if the amount (or each of the amounts) is an integer."""
+    if isinstance(amounts, np.ndarray):
+        return np.full(amounts.shape, amounts.dtype.kind in "iub")
+    if np.ndim(amounts) == 0:
+        return isinstance(amounts, (int, np.integer))
+    return np.array([isinstance(amount, (int, np.integer)) for amount in amounts])
+
+
+def _to_python(values, integral):
+    """Return the array values as list, integers where integral is True."""
+    return [
+        int(value) if is_int else value
+        for value, is_int in zip(values.tolist(), integral.tolist())
+    ]
+
+
+class EventsContainer:
     """
     EventsContainer provides events based on the level of the contaier.
 
     It is a generic container, which has a default behavior, but can be used for
     storing arbitrary objects.
 
+    The state of every container (id, capacity and level) is kept in a
+    dictionary by id, so the level and capacity are looked up in constant time.
+    Every container has a companion container for the reservations, with the
+    id "<id>_reservations".
+
+    The levels of the pending level events are kept sorted per container id
+    and operator. When the level of a container changes, only the events of
+    which the level is crossed are looked up (by bisection) and triggered.
+    Triggered events are removed from this index, and the events are
+    forgotten once they are processed, a later request of the same level
+    returns a new event.
+
+    The EventsContainer used to be a simpy.FilterStore, it no longer is.
+    The items are still available as a list of dictionaries (items).
+
     Parameters
     ----------
     store_capacity
-        Number of stores that can be contained by the multicontainer
+        Deprecated and ignored, the number of containers is not limited.
     """
 
-    def __init__(self, env, store_capacity: int = 1, *args, **kwargs):
-        super().__init__(env, capacity=store_capacity * 2)
+    def __init__(self, env, store_capacity: int = None, *args, **kwargs):
         self._env = env
+        if store_capacity is not None:
+            warnings.warn(
+                "The store_capacity of an EventsContainer is deprecated and "
+                "ignored, the number of containers is not limited.",
+                DeprecationWarning,
+            )
+        # the number of items (containers and reservations) is not limited
+        self.capacity = math.inf
+        # state of the containers by id, in the order they were initialized
+        self._items: dict = {}
+        # pending (not yet processed) level events by (id_, level, operator)
         self._container_events: dict = {}
+        # order in which the keys of the pending events were requested
+        self._event_order: dict = {}
+        self._event_count = 0
+        # sorted levels of the pending events by (id_, operator)
+        self._thresholds: dict = {}
+        # ids of which the level changed since the last update of the events
+        self._changed: set = set()
+        # incremented on every change of the levels
+        self._version = 0
 
     def initialize_container(self, initials):
         """Initialize method used for MultiContainers."""
@@ -42,32 +96,31 @@ class EventsContainer(simpy.FilterStore):
                 "level": item["level"],
             }
 
-            super().put(container_item)
-            super().put(reservation_item)
+            self._items[container_item["id"]] = container_item
+            self._items[reservation_item["id"]] = reservation_item
+            self._changed.update([container_item["id"], reservation_item["id"]])
+        self._version += 1
+
+    @property
+    def items(self):
+        """the state of the containers as list of dictionaries"""
+        return list(self._items.values())
 
     @property
     def container_list(self):
-        return [
-            item["id"]
-            for item in self.items
-            if not item["id"].endswith("_reservations")
-        ]
+        return [id_ for id_ in self._items if not id_.endswith("_reservations")]
 
     def get_capacity(self, id_="default"):
-        if self.items is None:
+        item = self._items.get(id_)
+        if item is None:
             return 0
-        res = [item["capacity"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        return item["capacity"]
 
     def get_level(self, id_="default"):
-        if self.items is None:
+        item = self._items.get(id_)
+        if item is None:
             return 0
-        res = [item["level"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        return item["level"]
 
     def get_container_event(self, level, operator, id_="default"):
         assert operator in ["gt", "ge", "lt", "le"], (
@@ -75,18 +128,23 @@ class EventsContainer(simpy.FilterStore):
             "from: 'gt', 'ge', 'lt', 'le'"
         )
 
-        self._container_events.setdefault((id_, level, operator), self._env.event())
-
-        event = self._container_events.get((id_, level, operator))
-        current_level = self.get_level(id_)
-        event_status = getattr(py_opp, operator)(current_level, level)
-
-        if not event or (not event_status and event.processed):
-            # If event_status is still correct keep it otherwise overwrite it.
-            self._container_events[(id_, level, operator)] = self._env.event()
+        key = (id_, level, operator)
+        event = self._container_events.get(key)
+        if event is None:
+            self._event_order[key] = self._event_count
+            self._event_count += 1
+            event = self._container_events[key] = self._env.event()
+            event.callbacks.append(lambda event: self._forget_event(key))
+            insort(self._thresholds.setdefault((id_, operator), []), level)
+            self._changed.add(id_)
 
         self.update_container_events()
-        return self._container_events[(id_, level, operator)]
+        return event
+
+    def _forget_event(self, key):
+        """Remove a processed level event, its level is no longer indexed."""
+        del self._container_events[key]
+        del self._event_order[key]
 
     def get_empty_event(self, id_="default"):
         return self.get_container_event(
@@ -103,27 +161,411 @@ class EventsContainer(simpy.FilterStore):
         )
 
     def update_container_events(self):
-        for (id_, level, operator), event in self._container_events.items():
+        """Trigger the pending events of the changed containers which are met."""
+        triggered = []
+        for id_ in self._changed:
             current_level = self.get_level(id_)
-            event_status = getattr(py_opp, operator)(current_level, level)
-            if event_status and not event.triggered:
+            for operator in ["gt", "ge", "lt", "le"]:
+                levels = self._thresholds.get((id_, operator))
+                if not levels:
+                    continue
+                if operator == "gt":
+                    crossed = slice(0, bisect_left(levels, current_level))
+                elif operator == "ge":
+                    crossed = slice(0, bisect_right(levels, current_level))
+                elif operator == "lt":
+                    crossed = slice(bisect_right(levels, current_level), None)
+                else:
+                    crossed = slice(bisect_left(levels, current_level), None)
+                triggered.extend((id_, level, operator) for level in levels[crossed])
+                del levels[crossed]
+        self._changed.clear()
+
+        # trigger the events in the order in which they were requested
+        triggered.sort(key=self._event_order.__getitem__)
+        for key in triggered:
+            event = self._container_events[key]
+            if not event.triggered:
                 event.succeed()
 
+    def change_level(self, amount, id_="default"):
+        """
+        Change the level of the container with id_ by amount (synchronously).
+
+        The level events which are met are triggered directly, no event is
+        scheduled for the change itself.
+        """
+        self._add_level(id_, amount)
+        self._version += 1
+        self._changed.add(id_)
+        self.update_container_events()
+
     def put(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] + amount
-        put_event = super().put(store_status)
-        put_event.callbacks.append(self._callback)
+        """
+        Put amount in the container with id_.
 
-        return put_event
+        The level is changed immediately. The level events are updated when
+        the returned (succeeded) event is processed.
+        """
+        self._add_level(id_, amount)
+        return self._level_changed(id_)
 
     def get(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] - amount
-        get_event = super().put(store_status)
-        get_event.callbacks.append(self._callback)
+        """
+        Get amount from the container with id_.
+
+        The level is changed immediately. The level events are updated when
+        the returned (succeeded) event is processed.
+        """
+        self._add_level(id_, -amount)
+        return self._level_changed(id_)
+
+    def _add_level(self, id_, amount):
+        self._items[id_]["level"] += amount
+
+    def _bundle(self, amounts, ids=None):
+        """Return the ids and amounts of a bundle (dictionary or vector)."""
+        if isinstance(amounts, dict):
+            return list(amounts), list(amounts.values())
+        ids = self.container_list if ids is None else list(ids)
+        return ids, list(amounts)
 
-        return get_event
+    def can_transfer(self, destination, amounts, ids=None):
+        """
+        Return True if the bundle of amounts can be moved to destination.
+
+        That is, if this container holds all amounts and destination has the
+        space for all of them, see transfer.
+        """
+        ids, amounts = self._bundle(amounts, ids)
+        return all(
+            self.get_level(id_) >= amount
+            and destination.get_level(id_) + amount <= destination.get_capacity(id_)
+            for id_, amount in zip(ids, amounts)
+        )
+
+    def get_transfer_event(self, destination, amounts, ids=None):
+        """
+        Return a single event which is triggered when the bundle of amounts
+        can be moved to destination, see transfer.
+        """
+        ids, amounts = self._bundle(amounts, ids)
+        events = []
+        for id_, amount in zip(ids, amounts):
+            events.append(self.get_container_event(amount, "ge", id_))
+            events.append(
+                destination.get_container_event(
+                    destination.get_capacity(id_) - amount, "le", id_
+                )
+            )
+        return self._env.all_of(events)
+
+    def transfer(self, destination, amounts, ids=None, reserved_amounts=None):
+        """
+        Transfer a bundle of amounts from this container to destination.
+
+        The bundle is moved in one atomic step: either all amounts are moved
+        or, if this container does not hold all amounts or destination does
+        not have the space for all of them, nothing is changed and a
+        ValueError is raised. The level events of both containers are updated
+        once, after all levels have been changed.
+
+        Parameters
+        ----------
+        destination
+            the EventsContainer to move the amounts to, the ids of the
+            containers are matched by name
+        amounts
+            dictionary with the amount by container id, or a vector of
+            amounts for the containers in ids
+        ids
+            the ids of the containers of a vector of amounts, all containers
+            (in the order of container_list) if None
+        reserved_amounts
+            the amounts that were reserved for the transfer (in the same
+            format as amounts), the reservations of both containers are
+            corrected with the actual amounts
+        """
+        ids, amounts = self._bundle(amounts, ids)
+        if not self.can_transfer(destination, amounts, ids):
+            raise ValueError(
+                f"The bundle {dict(zip(ids, amounts))} cannot be transferred, "
+                "not all content or space is available."
+            )
+
+        for id_, amount in zip(ids, amounts):
+            self._add_level(id_, -amount)
+            destination._add_level(id_, amount)
+        changed = ids
+        if reserved_amounts is not None:
+            _, reserved_amounts = self._bundle(reserved_amounts, ids)
+            changed = ids + [f"{id_}_reservations" for id_ in ids]
+            for id_, amount, reserved in zip(ids, amounts, reserved_amounts):
+                self._add_level(f"{id_}_reservations", reserved - amount)
+                destination._add_level(f"{id_}_reservations", amount - reserved)
+        self._transferred(destination, changed)
+
+    def _transferred(self, destination, changed):
+        """Update the level events of both containers after a transfer."""
+        containers = [self] if destination is self else [self, destination]
+        for container in containers:
+            container._version += 1
+            container._changed.update(changed)
+            container.update_container_events()
+
+    def _level_changed(self, id_):
+        self._version += 1
+        self._changed.add(id_)
+        event = self._env.event()
+        event.callbacks.append(self._callback)
+        return event.succeed()
 
     def _callback(self, event, id_="default"):
         self.update_container_events()
+
+
+class MultiEventsContainer(EventsContainer):
+    """
+    EventsContainer for many containers (e.g. cargo types), backed by arrays.
+
+    The levels, reservation levels and capacities of the containers are kept
+    in NumPy arrays, indexed by the position of the container id. Next to
+    the methods of the EventsContainer, it offers bulk operations on all (or
+    a selection of) the containers. The levels are stored as floats, the
+    levels (and capacities) of containers that were initialized with integers
+    and only changed by integer amounts are returned as integers, like those
+    of the EventsContainer.
+
+    The arrays grow when more containers are initialized.
+
+    Parameters
+    ----------
+    store_capacity
+        Deprecated and ignored, the number of containers is not limited.
+    """
+
+    def __init__(self, env, store_capacity: int = None, *args, **kwargs):
+        super().__init__(env, store_capacity=store_capacity, *args, **kwargs)
+        self._ids: list = []
+        self._index: dict = {}
+        self._reservation_index: dict = {}
+        self._levels = np.zeros(0)
+        self._reservations = np.zeros(0)
+        self._capacities = np.zeros(0)
+        # whether the levels, reservations and capacities are integers
+        self._integral_levels = np.zeros(0, dtype=bool)
+        self._integral_reservations = np.zeros(0, dtype=bool)
+        self._integral_capacities = np.zeros(0, dtype=bool)
+
+    def initialize_container(self, initials):
+        """Initialize method used for MultiContainers."""
+        for item in initials:
+            assert "id" in item
+            assert "capacity" in item
+            assert "level" in item
+            assert not item["id"].endswith("_reservations")
+
+            i = self._index.get(item["id"])
+            if i is None:
+                i = len(self._ids)
+                self._ids.append(item["id"])
+                self._index[item["id"]] = i
+                self._reservation_index[f"{item['id']}_reservations"] = i
+                self._levels = np.append(self._levels, 0.0)
+                self._reservations = np.append(self._reservations, 0.0)
+                self._capacities = np.append(self._capacities, 0.0)
+                self._integral_levels = np.append(self._integral_levels, False)
+                self._integral_reservations = np.append(
+                    self._integral_reservations, False
+                )
+                self._integral_capacities = np.append(self._integral_capacities, False)
+
+            self._capacities[i] = item["capacity"]
+            self._levels[i] = item["level"]
+            self._reservations[i] = item["level"]
+            self._integral_capacities[i] = _is_integral(item["capacity"])
+            self._integral_levels[i] = _is_integral(item["level"])
+            self._integral_reservations[i] = _is_integral(item["level"])
+            self._changed.update([item["id"], f"{item['id']}_reservations"])
+        self._version += 1
+
+    def _locate(self, id_):
+        """Return the array and index of the level of id_ (None if unknown)."""
+        i = self._index.get(id_)
+        if i is not None:
+            return self._levels, i
+        i = self._reservation_index.get(id_)
+        if i is not None:
+            return self._reservations, i
+        return None, None
+
+    def _integral(self, levels):
+        """Return the flags of the integer levels of the array of levels."""
+        if levels is self._levels:
+            return self._integral_levels
+        return self._integral_reservations
+
+    def _level_values(self, ids=None, reservations=False):
+        """Return the levels as list, see get_levels."""
+        levels = self._reservations if reservations else self._levels
+        indices = self._indices(ids)
+        return _to_python(levels[indices], self._integral(levels)[indices])
+
+    @property
+    def items(self):
+        """the state of the containers as list of dictionaries"""
+        items = []
+        for id_, level, reservation, capacity in zip(
+            self._ids,
+            _to_python(self._levels, self._integral_levels),
+            _to_python(self._reservations, self._integral_reservations),
+            _to_python(self._capacities, self._integral_capacities),
+        ):
+            items.append({"id": id_, "capacity": capacity, "level": level})
+            items.append(
+                {
+                    "id": f"{id_}_reservations",
+                    "capacity": capacity,
+                    "level": reservation,
+                }
+            )
+        return items
+
+    @property
+    def container_list(self):
+        return list(self._ids)
+
+    def get_capacity(self, id_="default"):
+        levels, i = self._locate(id_)
+        if levels is None:
+            return 0
+        if self._integral_capacities[i]:
+            return int(self._capacities[i])
+        return self._capacities[i].item()
+
+    def get_level(self, id_="default"):
+        levels, i = self._locate(id_)
+        if levels is None:
+            return 0
+        if self._integral(levels)[i]:
+            return int(levels[i])
+        return levels[i].item()
+
+    def _add_level(self, id_, amount):
+        levels, i = self._locate(id_)
+        if levels is None:
+            raise KeyError(id_)
+        levels[i] += amount
+        self._integral(levels)[i] &= _is_integral(amount)
+
+    def _indices(self, ids):
+        if ids is None:
+            return slice(None)
+        return [self._index[id_] for id_ in ids]
+
+    def get_levels(self, ids=None, reservations=False):
+        """
+        Return a snapshot (copy) of the levels of the containers (floats).
+
+        Parameters
+        ----------
+        ids
+            the ids of the containers, all containers (in the order of
+            container_list) if None
+        reservations
+            if True, the levels of the reservations are returned
+        """
+        levels = self._reservations if reservations else self._levels
+        return levels[self._indices(ids)].copy()
+
+    def get_capacities(self, ids=None):
+        """Return the capacities of the containers, see get_levels."""
+        return self._capacities[self._indices(ids)].copy()
+
+    def get_fill_degree(self, ids=None):
+        """Return the total level divided by the total capacity of the containers."""
+        indices = self._indices(ids)
+        capacity = self._capacities[indices].sum()
+        if capacity == 0:
+            return 0.0
+        return (self._levels[indices].sum() / capacity).item()
+
+    def change_levels(self, amounts, ids=None, reservations=False):
+        """
+        Change the levels of the containers by a vector of amounts (synchronously).
+
+        Parameters
+        ----------
+        amounts
+            the amounts (positive to put, negative to get) per container
+        ids
+            the ids of the containers, all containers (in the order of
+            container_list) if None
+        reservations
+            if True, the levels of the reservations are changed
+        """
+        indices = self._indices(ids)
+        levels = self._reservations if reservations else self._levels
+        np.add.at(levels, indices, amounts)
+        np.logical_and.at(self._integral(levels), indices, _is_integral(amounts))
+
+        changed = self._ids if ids is None else ids
+        if reservations:
+            changed = [f"{id_}_reservations" for id_ in changed]
+        self._changed.update(changed)
+        self._version += 1
+        self.update_container_events()
+
+    def can_transfer(self, destination, amounts, ids=None):
+        """Return True if the bundle can be moved to destination, see transfer."""
+        if not isinstance(destination, MultiEventsContainer):
+            return super().can_transfer(destination, amounts, ids)
+        ids, amounts = self._bundle(amounts, ids)
+        amounts = np.asarray(amounts, dtype=float)
+        origin_levels = self._levels[self._indices(ids)]
+        indices = destination._indices(ids)
+        destination_space = (
+            destination._capacities[indices] - destination._levels[indices]
+        )
+        return bool(
+            np.all(origin_levels >= amounts) and np.all(amounts <= destination_space)
+        )
+
+    def transfer(self, destination, amounts, ids=None, reserved_amounts=None):
+        """
+        Transfer a bundle of amounts from this container to destination.
+
+        The levels of both containers are changed with vector operations, see
+        EventsContainer.transfer. The ids of the containers are matched by
+        name, so the destination can have the containers in another order.
+        """
+        if not isinstance(destination, MultiEventsContainer):
+            return super().transfer(destination, amounts, ids, reserved_amounts)
+        ids, amounts = self._bundle(amounts, ids)
+        if not self.can_transfer(destination, amounts, ids):
+            raise ValueError(
+                f"The bundle {dict(zip(ids, amounts))} cannot be transferred, "
+                "not all content or space is available."
+            )
+
+        integral = _is_integral(amounts)
+        amounts = np.asarray(amounts, dtype=float)
+        origin_indices = self._indices(ids)
+        destination_indices = destination._indices(ids)
+        np.subtract.at(self._levels, origin_indices, amounts)
+        np.add.at(destination._levels, destination_indices, amounts)
+        np.logical_and.at(self._integral_levels, origin_indices, integral)
+        np.logical_and.at(destination._integral_levels, destination_indices, integral)
+        changed = ids
+        if reserved_amounts is not None:
+            _, reserved_amounts = self._bundle(reserved_amounts, ids)
+            integral = integral & _is_integral(reserved_amounts)
+            correction = amounts - np.asarray(reserved_amounts, dtype=float)
+            np.subtract.at(self._reservations, origin_indices, correction)
+            np.add.at(destination._reservations, destination_indices, correction)
+            np.logical_and.at(self._integral_reservations, origin_indices, integral)
+            np.logical_and.at(
+                destination._integral_reservations, destination_indices, integral
+            )
+            changed = ids + [f"{id_}_reservations" for id_ in ids]
+        self._transferred(destination, changed)
@@ -0,0 +1,49 @@
+"""Table to intern the ids of the simulation as compact integer codes."""
+
+
+class IdTable:
+    """
+    Table which interns ids (e.g. the uuid strings of activities) as integers.
+
+    The first id that is added gets code 0, the next new id code 1, etc. The
+    codes are used to store ids compactly (e.g. in the log) and to join on,
+    the ids are only resolved when the results are returned.
+
+    One table is shared by all objects of an environment, see get_id_table.
+    """
+
+    def __init__(self):
+        self.ids: list = []
+        self._codes: dict = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_):
+        return id_ in self._codes
+
+    def code(self, id_):
+        """Return the code of id_, the id is added if it is not yet known."""
+        code = self._codes.get(id_)
+        if code is None:
+            code = self._codes[id_] = len(self.ids)
+            self.ids.append(id_)
+        return code
+
+    def get_id(self, code):
+        """Return the id of the given code."""
+        return self.ids[code]
+
+    def get_ids(self, codes):
+        """Return the list of ids of the given codes."""
+        ids = self.ids
+        return [ids[code] for code in codes]
+
+
+def get_id_table(env):
+    """Return the IdTable of the environment, it is created on first use."""
+    table = getattr(env, "id_table", None)
+    if table is None:
+        table = IdTable()
+        env.id_table = table
+    return table
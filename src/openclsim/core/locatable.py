@@ -1,10 +1,11 @@
 """Component to locate the simulation objects."""
 from typing import Optional
 
-import pyproj
-import shapely.geometry
 from shapely.geometry.base import BaseGeometry
 
+from .distance import WGS84, compute_distance, get_distance_cache
+from .spatial_index import get_spatial_index
+
 
 class Locatable:
     """Something with a geometry (geojson format). Can be a point as well as a
@@ -15,7 +16,10 @@ class Locatable:
     Parameters
     ----------
     geometry : Shapely Geometry that determines the position of an object.
-    Coordinates are expected to be in wgs84 lon, lat.
+    Coordinates are expected to be in wgs84 lon, lat. The geometry is part of
+    the logged object state, unless the log_geometry attribute of the
+    environment is False (the positions of a Movable can then be found with
+    position_at).
     node: Optional string that locates an object on a graph.
 
     """
@@ -28,15 +32,30 @@ class Locatable:
         self.geometry = geometry
         # an optional node for locating an object on a network
         self.node = node
-        # used for distance computation
-        self.wgs84 = pyproj.Geod(ellps="WGS84")
+        # used for distance computation, shared by all objects
+        self.wgs84 = WGS84
+        # the objects of an environment are kept in its spatial index (if any)
+        if hasattr(self, "env"):
+            self._spatial_index = get_spatial_index(self.env)
+            if self._spatial_index is not None:
+                self._spatial_index.add(self)
+
+    @property
+    def geometry(self):
+        """the geometry, the spatial index is updated when it is set"""
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry):
+        self._geometry = geometry
+        index = getattr(self, "_spatial_index", None)
+        if index is not None:
+            index.update(self)
 
     def is_at(self, locatable, tolerance=100):
-        current_location = shapely.geometry.shape(self.geometry)
-        other_location = shapely.geometry.shape(locatable.geometry)
-        _, _, distance = self.wgs84.inv(
-            current_location.x, current_location.y, other_location.x, other_location.y
-        )
+        # the distance cache is shared by the objects of the environment
+        cache = get_distance_cache(self.env) if hasattr(self, "env") else None
+        distance = compute_distance(self.geometry, locatable.geometry, cache)
 
         return distance < tolerance
 
@@ -45,7 +64,8 @@ class Locatable:
         if hasattr(super(), "get_state"):
             state = super().get_state()
 
-        state.update({"geometry": self.geometry})
+        if getattr(getattr(self, "env", None), "log_geometry", True):
+            state.update({"geometry": self.geometry})
         if self.node is not None:
             state["node"] = self.node
 
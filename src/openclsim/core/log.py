@@ -2,13 +2,15 @@
 import datetime
 import numbers
 import warnings
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Optional, Union
 
 import deprecated
 import pandas as pd
 import shapely
 
+from .id_table import get_id_table
+from .log_store import LogbookView, LogStore, _copy_state
 from .simpy_object import SimpyObject
 
 
@@ -26,6 +28,54 @@ class LogState(Enum):
     UNKNOWN = -1
 
 
+class LogLevel(IntEnum):
+    """
+    LogLevel enumeration of the verbosity of the log of a Log object.
+
+    NONE
+        no entries are logged
+    TOP
+        only the START and STOP entries of the top-level activities (the
+        activities which are not a sub process of another activity)
+    BASE
+        the START and STOP entries of all activities and simulation objects
+    FULL
+        also the WAIT entries and the START and STOP entries of the sub
+        processes in the logs of the structural activities (default)
+
+    The level is set with the log_level argument of a Log object (e.g. an
+    activity or a vessel) or with the log_level attribute of the environment.
+    It can be given as LogLevel or as its (case-insensitive) name.
+    """
+
+    NONE = 0
+    TOP = 1
+    BASE = 2
+    FULL = 3
+
+
+def check_log_level(objects, level: LogLevel, analysis: str):
+    """
+    Check that the Log objects log at least at the level required by an analysis.
+
+    Parameters
+    ----------
+    objects
+        the Log objects of which the logs are analysed
+    level
+        the minimal LogLevel the analysis requires
+    analysis
+        name of the analysis, used in the error message
+    """
+    for obj in objects:
+        log_level = getattr(obj, "log_level", LogLevel.FULL)
+        if log_level < level:
+            raise ValueError(
+                f"{analysis} requires log_level {level.name} or higher, but "
+                f"{getattr(obj, 'name', obj)} has log_level {log_level.name}"
+            )
+
+
 class PerformsActivity:
     """An object can perform activities. For example a ship might be moing as
     part of a project activity like mobilization ("mobilization"). In that case
@@ -49,43 +99,146 @@ class PerformsActivity:
 
 
 class Log(SimpyObject):
-    """Log class to log the object activities."""
+    """
+    Log class to log the object activities.
+
+    Parameters
+    ----------
+    state_logging
+        "full" records the complete ObjectState with every entry, "delta" only
+        records the fields of the ObjectState that changed since the previous
+        entry. The log that is read is the same in both modes. If not given,
+        the state_logging attribute of the environment is used ("full" by
+        default).
+    log_level
+        the LogLevel (or its name) of the entries that are logged. If not
+        given, the log_level attribute of the environment is used ("full" by
+        default).
+
+    If the environment has an ``event_journal`` (see EventJournal), the
+    entries are appended to the journal and the log is a view on the journal.
+    """
+
+    _log_columns = [
+        "Timestamp",
+        "ActivityID",
+        "ActivityState",
+        "ObjectState",
+        "ActivityLabel",
+    ]
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        state_logging: Optional[str] = None,
+        log_level: Union[LogLevel, str, None] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         """Initialization"""
-        # record oriented list of log messages
-        self.logbook = []
+        if log_level is None:
+            log_level = getattr(self.env, "log_level", LogLevel.FULL)
+        self.log_level = log_level
+
+        if state_logging is None:
+            state_logging = getattr(self.env, "state_logging", "full")
+        assert state_logging in ["full", "delta"], (
+            f"Chosen state_logging ({state_logging}) is not supported please "
+            "choose from: 'full', 'delta'"
+        )
+        self.state_logging = state_logging
+        # column oriented store of log messages
+        journal = getattr(self.env, "event_journal", None)
+        if journal is not None:
+            assert (
+                state_logging == "full"
+            ), "An event_journal only supports state_logging 'full'"
+            self._log_store = journal.add_object(self)
+        else:
+            self._log_store = LogStore(
+                delta_state=state_logging == "delta",
+                id_table=get_id_table(self.env),
+            )
+        # the sink to which entries are streamed without keeping them in memory
+        self._log_streamed = None
+        # (store, number of entries, columns) of the converted log
+        self._log_cache = None
+
+    @property
+    def log_level(self):
+        """the LogLevel of the entries that are logged"""
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, value):
+        if isinstance(value, str):
+            assert value.upper() in LogLevel.__members__, (
+                f"Chosen log_level ({value}) is not supported please "
+                "choose from: 'none', 'top', 'base', 'full'"
+            )
+            value = LogLevel[value.upper()]
+        self._log_level = LogLevel(value)
+        self._update_log_threshold()
+
+    def _is_top_level(self):
+        """Return True if the object is a top-level activity."""
+        return False
+
+    def _update_log_threshold(self):
+        """Set the highest level of the entries that are logged (as int)."""
+        threshold = self._log_level
+        if threshold == LogLevel.TOP:
+            threshold = LogLevel.BASE if self._is_top_level() else LogLevel.NONE
+        self._log_threshold = int(threshold)
+
+    @property
+    def logbook(self):
+        """return the record oriented view of the log messages"""
+        return LogbookView(self._log_store, owner=self)
+
+    @logbook.setter
+    def logbook(self, value):
+        """replace the log messages by the given records
+
+        If the object logs to an event journal, the journal keeps the
+        previous entries and the object gets a store of its own.
+        """
+        self._log_store = LogStore(
+            delta_state=self.state_logging == "delta",
+            id_table=self._log_store.id_table,
+        )
+        for record in value:
+            self._log_store.append_record(record)
 
     @property
     def log(self):
         """return the log in log format (compatible with old log attribute)"""
-        df = pd.DataFrame(self.logbook)
-
-        columns = [
-            "Timestamp",
-            "ActivityID",
-            "ActivityState",
-            "ObjectState",
-            "ActivityLabel",
-        ]
+        store = self._log_store
+        if self._log_streamed:
+            raise RuntimeError(
+                f"The log entries of {getattr(self, 'name', self)} are streamed to "
+                f"{self._log_streamed.path}, read them from the sink instead."
+            )
+        if not store.has_records:
+            # all entries are in openclsim format, copy the cached columns
+            columns = self._get_log_columns()
+            log = {key: list(values) for key, values in columns.items()}
+            log["ObjectState"] = [_copy_state(value) for value in log["ObjectState"]]
+            log["ActivityLabel"] = [dict(value) for value in log["ActivityLabel"]]
+            return log
+
+        df = pd.DataFrame(list(self.logbook))
+
         # only return columns that we know from openclsim
-        columns_to_drop = set(df.columns) - set(columns)
+        columns_to_drop = set(df.columns) - set(self._log_columns)
 
         df = df.drop(columns=columns_to_drop)
 
         df = df.dropna(how="all")
 
-        if not self.logbook:
+        if not len(store):
             # add columns from old formats
-            empty = {
-                "Timestamp": [],
-                "ActivityID": [],
-                "ActivityState": [],
-                "ObjectState": [],
-                "ActivityLabel": [],
-            }
-            df = pd.DataFrame(empty)
+            df = pd.DataFrame({key: [] for key in self._log_columns})
 
         # Convert table to this format:
         # {'a': [1, 2], 'b': [2, 4]}
@@ -93,6 +246,32 @@ class Log(SimpyObject):
 
         return list_format
 
+    def _get_log_columns(self):
+        """
+        Return the columns of the log in log format.
+
+        The converted columns are cached. Only the entries that were added
+        since the previous call are converted and appended to the cache.
+        """
+        store = self._log_store
+        cache = self._log_cache
+        if cache is None or cache[0] is not store:
+            cache = (store, 0, {key: [] for key in self._log_columns})
+
+        _, size, columns = cache
+        if size < len(store):
+            columns["Timestamp"].extend(
+                pd.Series(store.get_datetimes(size).astype("datetime64[ns]"))
+            )
+            columns["ActivityID"].extend(store.get_activity_ids(size))
+            columns["ActivityState"].extend(store.get_activity_states(size))
+            columns["ObjectState"].extend(store.get_object_states(size))
+            columns["ActivityLabel"].extend(store.get_activity_labels(size))
+            cache = (store, len(store), columns)
+
+        self._log_cache = cache
+        return columns
+
     # decorate the log setter.
     # throw a deprecation warning and ignore the setting
     @log.setter
@@ -111,9 +290,21 @@ class Log(SimpyObject):
         activity_label: Optional[dict] = None,
     ):
         """Log an entry (openclsim version).
-        - Time (t) should b an timestamp in seconds since 1970 in utc.
+        - Time (t) should b an timestamp in seconds since 1970 in utc. It is
+          stored as float and converted to a datetime when the log is read.
+        - If a log_sink is set on the environment, the entry is streamed to it.
+        - Entries above the log_level of the object are skipped. WAIT entries
+          and entries with a "subprocess" activity_label are at level FULL,
+          the other entries at level BASE.
 
         """
+        threshold = self._log_threshold
+        if threshold < LogLevel.FULL and (
+            threshold == LogLevel.NONE
+            or activity_state in (LogState.WAIT_START, LogState.WAIT_STOP)
+            or (activity_label and activity_label.get("type") == "subprocess")
+        ):
+            return
 
         object_state = self.get_state()
         if additional_state:
@@ -127,14 +318,18 @@ class Log(SimpyObject):
             assert activity_label.get("type") is not None
             assert activity_label.get("ref") is not None
 
-        entry = {
-            "Timestamp": datetime.datetime.utcfromtimestamp(t),
-            "ActivityID": activity_id,
-            "ActivityState": activity_state.name,
-            "ObjectState": object_state,
-            "ActivityLabel": activity_label,
-        }
-        self.logbook.append(entry)
+        sink = getattr(self.env, "log_sink", None)
+        if sink is not None:
+            sink.add(
+                self, t, activity_id, activity_state.name, object_state, activity_label
+            )
+            if not sink.keep_in_memory:
+                self._log_streamed = sink
+                return
+
+        self._log_store.append(
+            t, activity_id, activity_state.name, object_state, activity_label
+        )
 
     def log_entry_v0(self, log: str, t: float, value, geometry_log: shapely.Geometry):
         """Log an entry (opentnsim version)"""
@@ -144,7 +339,7 @@ class Log(SimpyObject):
             "Value": value,
             "Geometry": geometry_log,
         }
-        self.logbook.append(entry)
+        self._log_store.append_record(entry)
 
     @deprecated.deprecated(reason="Use .log_entry_v0 instead")
     def log_entry(self, *args, **kwargs):
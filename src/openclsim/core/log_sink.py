@@ -0,0 +1,199 @@
+"""Sinks to stream the log entries of the simulation objects to a file."""
+import abc
+import json
+import pathlib
+
+import numpy as np
+
+
+def _to_json(value):
+    """Convert values which are not JSON serializable (geometries, numpy types)."""
+    if hasattr(value, "wkt"):
+        return value.wkt
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class LogSink(abc.ABC):
+    """
+    Base class of the sinks which stream log entries to a file during the run.
+
+    A sink is configured per environment by setting it as the ``log_sink``
+    attribute of the simpy environment. All Log objects in that environment
+    then pass their entries to the sink. The entries are buffered in memory
+    and written in batches of ``batch_size`` entries, so the memory used by
+    the log is bounded.
+
+    The file contains one row per entry with the columns Object, ObjectID,
+    Timestamp, ActivityID, ActivityState, ObjectState and ActivityLabel. The
+    ObjectState and ActivityLabel are stored as JSON strings (geometries as
+    WKT). The files can be read with pandas.read_parquet or pandas.read_feather.
+
+    Parameters
+    ----------
+    path
+        file to write the log entries to
+    batch_size
+        number of entries that are buffered before they are written
+    keep_in_memory
+        if True, the entries are also kept in the logs of the objects, so the
+        .log of the objects remains available after the run.
+    """
+
+    columns = [
+        "Object",
+        "ObjectID",
+        "Timestamp",
+        "ActivityID",
+        "ActivityState",
+        "ObjectState",
+        "ActivityLabel",
+    ]
+
+    def __init__(self, path, batch_size: int = 10_000, keep_in_memory=False):
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError(
+                f"{type(self).__name__} requires pyarrow, install it with "
+                "`pip install pyarrow`"
+            ) from e
+
+        assert batch_size > 0, "batch_size should be larger than 0"
+
+        self.pa = pyarrow
+        self.path = pathlib.Path(path)
+        self.batch_size = batch_size
+        self.keep_in_memory = keep_in_memory
+        self.schema = pyarrow.schema(
+            [
+                ("Object", pyarrow.string()),
+                ("ObjectID", pyarrow.string()),
+                ("Timestamp", pyarrow.timestamp("us")),
+                ("ActivityID", pyarrow.string()),
+                ("ActivityState", pyarrow.string()),
+                ("ObjectState", pyarrow.string()),
+                ("ActivityLabel", pyarrow.string()),
+            ]
+        )
+
+        self.nr_entries = 0
+        self._buffer: dict = {column: [] for column in self.columns}
+        self._writer = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, log, t, activity_id, activity_state, object_state, activity_label):
+        """Add an entry of the given Log object to the buffer."""
+        if self._closed:
+            raise RuntimeError(f"Cannot add log entries to closed sink {self.path}")
+
+        buffer = self._buffer
+        buffer["Object"].append(getattr(log, "name", None))
+        buffer["ObjectID"].append(getattr(log, "id", None))
+        buffer["Timestamp"].append(t)
+        buffer["ActivityID"].append(activity_id)
+        buffer["ActivityState"].append(activity_state)
+        buffer["ObjectState"].append(object_state)
+        buffer["ActivityLabel"].append(activity_label)
+        self.nr_entries += 1
+
+        if len(buffer["Timestamp"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries to the file."""
+        buffer = self._buffer
+        if not buffer["Timestamp"]:
+            return
+
+        pa = self.pa
+        timestamps = np.round(np.array(buffer["Timestamp"], dtype=float) * 1e6)
+
+        def to_string(values):
+            return [None if value is None else str(value) for value in values]
+
+        def to_json(values):
+            return [json.dumps(value, default=_to_json) for value in values]
+
+        batch = pa.record_batch(
+            [
+                pa.array(to_string(buffer["Object"]), pa.string()),
+                pa.array(to_string(buffer["ObjectID"]), pa.string()),
+                pa.array(timestamps.astype(np.int64), pa.timestamp("us")),
+                pa.array(to_string(buffer["ActivityID"]), pa.string()),
+                pa.array(buffer["ActivityState"], pa.string()),
+                pa.array(to_json(buffer["ObjectState"]), pa.string()),
+                pa.array(to_json(buffer["ActivityLabel"]), pa.string()),
+            ],
+            schema=self.schema,
+        )
+        if self._writer is None:
+            self._writer = self._open_writer()
+        self._write_batch(batch)
+        self._buffer = {column: [] for column in self.columns}
+
+    def close(self):
+        """Write the remaining entries and close the file."""
+        if self._closed:
+            return
+        self.flush()
+        if self._writer is None:
+            # always leave a (possibly empty) file behind
+            self._writer = self._open_writer()
+        self._writer.close()
+        self._closed = True
+
+    def read(self):
+        """Close the sink and read the log entries in a pandas dataframe."""
+        self.close()
+        return self._read_table().to_pandas()
+
+    @abc.abstractmethod
+    def _open_writer(self):
+        """Return the writer of the file."""
+
+    @abc.abstractmethod
+    def _write_batch(self, batch):
+        """Write a pyarrow RecordBatch with the writer."""
+
+    @abc.abstractmethod
+    def _read_table(self):
+        """Return the log entries in the file as pyarrow Table."""
+
+
+class ParquetLogSink(LogSink):
+    """LogSink writing the log entries to a Parquet file (one row group per batch)."""
+
+    def _open_writer(self):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(str(self.path), self.schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def _read_table(self):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.read_table(str(self.path))
+
+
+class ArrowLogSink(LogSink):
+    """LogSink writing the log entries to an Arrow IPC file."""
+
+    def _open_writer(self):
+        return self.pa.ipc.new_file(str(self.path), self.schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def _read_table(self):
+        with self.pa.memory_map(str(self.path)) as source:
+            return self.pa.ipc.open_file(source).read_all()
@@ -0,0 +1,450 @@
+"""Columnar storage of the log entries of the simulation objects."""
+from collections.abc import MutableSequence
+
+import numpy as np
+
+from .id_table import IdTable
+
+
+def to_datetime64(timestamps):
+    """
+    Convert timestamps in seconds since 1970 (utc) to a datetime64[us] array.
+
+    The conversion is vectorized and rounds to microseconds in the same way as
+    datetime.datetime.utcfromtimestamp (round half to even).
+    """
+    fraction, seconds = np.modf(np.asarray(timestamps, dtype=np.float64))
+    microseconds = np.round(fraction * 1e6)
+    seconds = seconds.astype(np.int64)
+    microseconds = microseconds.astype(np.int64)
+
+    overflow = microseconds >= 1_000_000
+    seconds[overflow] += 1
+    microseconds[overflow] -= 1_000_000
+    underflow = microseconds < 0
+    seconds[underflow] -= 1
+    microseconds[underflow] += 1_000_000
+
+    return (seconds * 1_000_000 + microseconds).astype("datetime64[us]")
+
+
+# marks a field that is no longer part of the object state (delta encoding)
+_MISSING = object()
+
+
+def _equal(a, b):
+    """Return True if a and b are equal values of the same type."""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def _copy_state(state):
+    """Return a copy of an object state, with copies of its dictionaries."""
+    return {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in state.items()
+    }
+
+
+def _grow(array, size):
+    """Return array with room for at least size items (doubling the capacity)."""
+    if size <= len(array):
+        return array
+    shape = (max(size, 2 * len(array)),) + array.shape[1:]
+    new_array = np.empty(shape, dtype=array.dtype)
+    new_array[: len(array)] = array
+    return new_array
+
+
+class _StateColumn:
+    """
+    Column with the values of a single ObjectState field.
+
+    The column stores the rows (entry indices) at which the field was recorded
+    next to the values. Floats and integers are stored in typed NumPy buffers,
+    all other values (geometries, dictionaries) in a Python list. A typed
+    column falls back to a list as soon as a value of another type is added.
+    """
+
+    _dtypes = {float: np.float64, int: np.int64}
+
+    def __init__(self, value):
+        self.size = 0
+        self.rows = np.empty(16, dtype=np.int64)
+        dtype = self._dtypes.get(type(value))
+        self.values = np.empty(16, dtype=dtype) if dtype is not None else []
+
+    def append(self, row, value):
+        self.rows = _grow(self.rows, self.size + 1)
+        self.rows[self.size] = row
+
+        if isinstance(self.values, np.ndarray):
+            if self._dtypes.get(type(value)) is self.values.dtype.type:
+                self.values = _grow(self.values, self.size + 1)
+                self.values[self.size] = value
+                self.size += 1
+                return
+            self.values = self.values[: self.size].tolist()
+
+        self.values.append(value)
+        self.size += 1
+
+    def get_values(self, first=0, last=None):
+        """Return the list of recorded values [first, last)."""
+        last = self.size if last is None else last
+        if isinstance(self.values, np.ndarray):
+            return self.values[first:last].tolist()
+        return self.values[first:last]
+
+    def items(self, rows, delta=False):
+        """
+        Return the (i, value) pairs of the column for the entries rows[i].
+
+        The rows should be sorted. If delta is True, a value holds for all rows
+        until the next recorded value (delta encoding), otherwise only for the
+        row it was recorded at.
+        """
+        column_rows = self.rows[: self.size]
+        if delta:
+            positions = np.searchsorted(column_rows, rows, side="right") - 1
+            found = positions >= 0
+        else:
+            positions = np.searchsorted(column_rows, rows)
+            found = positions < self.size
+            found[found] = column_rows[positions[found]] == rows[found]
+
+        indices = np.flatnonzero(found)
+        if not len(indices):
+            return []
+        positions = positions[indices]
+        first = positions[0]
+        values = self.get_values(first, positions[-1] + 1)
+        return (
+            (i, values[position - first])
+            for i, position in zip(indices.tolist(), positions.tolist())
+            if values[position - first] is not _MISSING
+        )
+
+    def get(self, row, delta=False):
+        """Return the value at row (_MISSING if there is no value)."""
+        rows = self.rows[: self.size]
+        if delta:
+            i = np.searchsorted(rows, row, side="right") - 1
+            if i < 0:
+                return _MISSING
+        else:
+            i = np.searchsorted(rows, row)
+            if i == self.size or rows[i] != row:
+                return _MISSING
+        value = self.values[i]
+        return value.item() if isinstance(value, np.generic) else value
+
+
+class LogStore:
+    """
+    Columnar store of log entries.
+
+    Every entry is stored in growable NumPy buffers: the timestamp as float
+    (seconds since 1970 in utc) and the activity id, activity state and
+    activity label as integer codes into small lookup tables. The activity ids
+    are coded by an IdTable, which can be shared by the stores of all objects
+    in an environment. The ObjectState fields are stored in typed side-columns
+    per field name.
+
+    Records that do not follow the openclsim format (e.g. entries of
+    ``Log.log_entry_v0``) are kept as is, next to the columns.
+
+    Parameters
+    ----------
+    delta_state
+        If True, an ObjectState field is only recorded when its value changed
+        since the previous entry. The full ObjectState of every entry is
+        rebuilt when the log is read.
+    id_table
+        IdTable to code the activity ids with, a new table is used if None.
+    """
+
+    def __init__(self, delta_state=False, id_table=None):
+        self.delta_state = delta_state
+        self.id_table = id_table if id_table is not None else IdTable()
+        # the last recorded value of the ObjectState fields (delta encoding)
+        self._last_state: dict = {}
+
+        self._size = 0
+        self._timestamps = np.empty(64, dtype=np.float64)
+        self._activities = np.empty(64, dtype=np.int32)
+        self._states = np.empty(64, dtype=np.int8)
+        self._labels = np.empty(64, dtype=np.int32)
+
+        # lookup tables of the integer coded columns
+        self._state_names: list = []
+        self._state_codes: dict = {}
+        self._label_values: list = []
+        self._label_codes: dict = {}
+
+        self._state_columns: dict = {}
+        # rows which hold a record instead of an openclsim entry
+        self._records: dict = {}
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _intern(value, key, values, codes):
+        code = codes.get(key)
+        if code is None:
+            code = len(values)
+            codes[key] = code
+            values.append(value)
+        return code
+
+    def _reserve(self):
+        row = self._size
+        if row == len(self._timestamps):
+            self._timestamps = _grow(self._timestamps, row + 1)
+            self._activities = _grow(self._activities, row + 1)
+            self._states = _grow(self._states, row + 1)
+            self._labels = _grow(self._labels, row + 1)
+        self._size += 1
+        return row
+
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        """
+        Append an openclsim log entry.
+
+        Parameters
+        ----------
+        t
+            timestamp in seconds since 1970 in utc
+        activity_id
+            id of the activity (str, int or None)
+        activity_state
+            name of the activity state (e.g. "START")
+        object_state
+            dictionary with the state of the simulation object
+        activity_label
+            dictionary with the activity label
+
+        Returns
+        -------
+        int
+            the row of the entry
+        """
+        row = self._reserve()
+        self._timestamps[row] = t
+        self._activities[row] = self.id_table.code(activity_id)
+        self._states[row] = self._intern(
+            activity_state, activity_state, self._state_names, self._state_codes
+        )
+        try:
+            label_key = tuple(activity_label.items())
+            hash(label_key)
+        except TypeError:
+            # unhashable labels are not shared between entries
+            label_key = object()
+        self._labels[row] = self._intern(
+            activity_label, label_key, self._label_values, self._label_codes
+        )
+
+        if self.delta_state:
+            self._append_state_delta(row, object_state)
+            return row
+
+        for key, value in object_state.items():
+            column = self._state_columns.get(key)
+            if column is None:
+                column = self._state_columns[key] = _StateColumn(value)
+            column.append(row, value)
+        return row
+
+    def _append_state_delta(self, row, object_state):
+        """Record only the ObjectState fields that changed since the last entry."""
+        last_state = self._last_state
+        nr_known = 0
+        for key, value in object_state.items():
+            if key in last_state:
+                nr_known += 1
+                if _equal(last_state[key], value):
+                    continue
+            column = self._state_columns.get(key)
+            if column is None:
+                column = self._state_columns[key] = _StateColumn(value)
+            column.append(row, value)
+            last_state[key] = value
+
+        if nr_known < len(last_state) - (len(object_state) - nr_known):
+            # some fields are no longer part of the state
+            for key in [key for key in last_state if key not in object_state]:
+                self._state_columns[key].append(row, _MISSING)
+                del last_state[key]
+
+    def append_record(self, record):
+        """Append a record which is stored as is (e.g. opentnsim entries)."""
+        row = self._reserve()
+        self._records[row] = record
+        self._timestamps[row] = np.nan
+        self._activities[row] = -1
+        self._states[row] = -1
+        self._labels[row] = -1
+        return row
+
+    @property
+    def has_records(self):
+        """Return True if the store contains entries in another format."""
+        return len(self._records) > 0
+
+    @property
+    def timestamps(self):
+        """Return the timestamps as an array of floats (seconds since 1970)."""
+        return self._timestamps[: self._size]
+
+    def _select(self, start, rows):
+        """Return the index of the rows from start on (of the given rows)."""
+        if rows is None:
+            return slice(start, self._size)
+        return rows[start:]
+
+    def get_datetimes(self, start=0, rows=None):
+        """Return the timestamps from row start on as datetime64[us] array."""
+        return to_datetime64(self._timestamps[self._select(start, rows)])
+
+    def get_activity_codes(self, start=0, rows=None):
+        """Return the codes of the activity ids (see id_table) from row start on."""
+        return self._activities[self._select(start, rows)]
+
+    def get_activity_ids(self, start=0, rows=None):
+        """Return the list of activity ids from row start on."""
+        return self.id_table.get_ids(self.get_activity_codes(start, rows).tolist())
+
+    def get_activity_states(self, start=0, rows=None):
+        """Return the list of activity state names from row start on."""
+        codes = self._states[self._select(start, rows)].tolist()
+        return [self._state_names[code] for code in codes]
+
+    def get_activity_labels(self, start=0, rows=None):
+        """Return the list of activity labels from row start on (new dictionaries)."""
+        codes = self._labels[self._select(start, rows)].tolist()
+        return [dict(self._label_values[code]) for code in codes]
+
+    def get_object_state(self, row):
+        """Return the object state of a single entry."""
+        state = {}
+        for key, column in self._state_columns.items():
+            value = column.get(row, self.delta_state)
+            if value is not _MISSING:
+                state[key] = value
+        # the stored values (e.g. container levels) can be shared by entries
+        return _copy_state(state)
+
+    def get_object_states(self, start=0, rows=None):
+        """Return the list of object states from row start on (new dictionaries)."""
+        rows = np.arange(self._size)[self._select(start, rows)]
+        states: list = [{} for _ in range(len(rows))]
+        for key, column in self._state_columns.items():
+            for i, value in column.items(rows, self.delta_state):
+                states[i][key] = dict(value) if isinstance(value, dict) else value
+        return states
+
+    def get_record(self, row):
+        """Return a single entry as dictionary."""
+        if row in self._records:
+            return self._records[row]
+        return {
+            "Timestamp": to_datetime64(self._timestamps[row : row + 1]).item(),
+            "ActivityID": self.id_table.get_id(self._activities[row]),
+            "ActivityState": self._state_names[self._states[row]],
+            "ObjectState": self.get_object_state(row),
+            "ActivityLabel": dict(self._label_values[self._labels[row]]),
+        }
+
+    def get_records(self, rows=None):
+        """Return the entries (of the given rows) as a list of dictionaries."""
+        if self.has_records:
+            if rows is None:
+                rows = range(self._size)
+            return [self.get_record(row) for row in rows]
+
+        timestamps = self.get_datetimes(rows=rows).tolist()
+        activity_ids = self.get_activity_ids(rows=rows)
+        activity_states = self.get_activity_states(rows=rows)
+        object_states = self.get_object_states(rows=rows)
+        activity_labels = self.get_activity_labels(rows=rows)
+
+        records = []
+        for i in range(len(timestamps)):
+            records.append(
+                {
+                    "Timestamp": timestamps[i],
+                    "ActivityID": activity_ids[i],
+                    "ActivityState": activity_states[i],
+                    "ObjectState": object_states[i],
+                    "ActivityLabel": activity_labels[i],
+                }
+            )
+        return records
+
+
+class LogbookView(MutableSequence):
+    """
+    Record oriented view on a LogStore.
+
+    The records are created when the view is read. Appending a dictionary to
+    the view stores it as is in the underlying store. The other changes
+    (e.g. index assignment, deletion, clear) replace all records of the
+    owner (see Log.logbook), like the logbook list of earlier versions.
+    """
+
+    def __init__(self, store, owner=None):
+        self._store = store
+        self._owner = owner
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._store.get_records()[index]
+        if index < 0:
+            index += len(self._store)
+        if not 0 <= index < len(self._store):
+            raise IndexError("logbook index out of range")
+        return self._store.get_record(index)
+
+    def __iter__(self):
+        return iter(self._store.get_records())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def _replace(self, change):
+        """Apply change to a list of the records and store the result."""
+        if self._owner is None:
+            raise TypeError("the records of this logbook can only be appended")
+        records = list(self)
+        change(records)
+        self._owner.logbook = records
+        self._store = self._owner._log_store
+
+    def __setitem__(self, index, value):
+        self._replace(lambda records: records.__setitem__(index, value))
+
+    def __delitem__(self, index):
+        self._replace(lambda records: records.__delitem__(index))
+
+    def insert(self, index, value):
+        self._replace(lambda records: records.insert(index, value))
+
+    def clear(self):
+        self._replace(list.clear)
+
+    def append(self, record):
+        self._store.append_record(record)
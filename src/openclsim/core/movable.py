@@ -5,13 +5,15 @@ import warnings
 from typing import Callable, List, Optional
 
 import numpy as np
-import pyproj
 import shapely
 import shapely.geometry
 
 from .container import HasContainer, HasMultiContainer
+from .distance import WGS84, compute_distance, get_distance_cache
 from .locatable import Locatable
 from .log import Log, LogState, PerformsActivity
+from .network import get_route_network
+from .trips import TripLog
 
 # can be removed if we switch to python>=3.10
 try:
@@ -27,9 +29,6 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# we only have one earth, defined here.
-WGS84 = pyproj.Geod(ellps="WGS84")
-
 
 class Movable(Locatable, PerformsActivity, Log):
     """
@@ -38,6 +37,11 @@ class Movable(Locatable, PerformsActivity, Log):
     Used for object that can move with a fixed speed
     geometry: point used to track its current location
 
+    The trips of the object are recorded as segments in a TripLog (trips),
+    position_at and positions_at return the position at any time. The trip
+    log is started when the object is created at a point, otherwise on its
+    first move (trips is None until then).
+
     Parameters
     ----------
     v: speed, speed over ground of the object in m/s
@@ -49,6 +53,15 @@ class Movable(Locatable, PerformsActivity, Log):
         """Construct a movable object."""
         self._v = v
         self.engine_order = 1.0
+        self.trips = None
+        if isinstance(shapely.geometry.shape(self.geometry), shapely.geometry.Point):
+            self.trips = TripLog(self.geometry)
+
+    def _record_trip(self, start_time, end_time, origin, destination):
+        """Record a trip in the TripLog, it is started on the first trip."""
+        if self.trips is None:
+            self.trips = TripLog(origin)
+        self.trips.append(start_time, end_time, origin, destination)
 
     def move(
         self,
@@ -84,7 +97,9 @@ class Movable(Locatable, PerformsActivity, Log):
             duration = self.compute_duration(self.geometry, destination.geometry)
 
         # Check out the time based on duration of sailing event
+        start_time = self.env.now
         yield self.env.timeout(duration, value=self.activity_id)
+        self._record_trip(start_time, self.env.now, self.geometry, destination.geometry)
 
         # Set mover geometry to destination geometry
         self.geometry = shapely.geometry.shape(destination.geometry)
@@ -96,6 +111,20 @@ class Movable(Locatable, PerformsActivity, Log):
             LogState.STOP,
         )
 
+    def position_at(self, t):
+        """Return the position (shapely Point) at time t, see TripLog."""
+        return self._get_trips().position_at(t)
+
+    def positions_at(self, times):
+        """Return the positions (lon, lat) at the given times, an array (n, 2)."""
+        return self._get_trips().positions_at(times)
+
+    def _get_trips(self):
+        """Return the TripLog, the current geometry if the object did not move."""
+        if self.trips is None:
+            return TripLog(self.geometry)
+        return self.trips
+
     @property
     def v(self):
         """return the velocity * engine_order"""
@@ -110,18 +139,22 @@ class Movable(Locatable, PerformsActivity, Log):
         return self.v
 
     @staticmethod
-    def compute_distance(origin: shapely.Geometry, destination: shapely.Geometry):
-        """Determine the sailing distance based on great circle path from origin to destination."""
-        orig = shapely.geometry.shape(origin)
-        dest = shapely.geometry.shape(destination)
-        _, _, distance = WGS84.inv(orig.x, orig.y, dest.x, dest.y)
-        return distance
+    def compute_distance(
+        origin: shapely.Geometry, destination: shapely.Geometry, cache=None
+    ):
+        """Determine the sailing distance based on great circle path from origin to destination.
+
+        The distance is looked up in (and added to) cache, if given.
+        """
+        return compute_distance(origin, destination, cache)
 
     def compute_duration(
         self, origin: shapely.Geometry, destination: shapely.Geometry, engine_order=1.0
     ):
         """Determine the duration based on great circle path from origin to destination."""
-        distance = self.compute_distance(origin, destination)
+        distance = self.compute_distance(
+            origin, destination, cache=get_distance_cache(self.env)
+        )
         return distance / (self.v * engine_order)
 
 
@@ -176,23 +209,23 @@ class MultiContainerDependentMovable(Movable, HasMultiContainer):
 
     @property
     def v(self):
-        sum_level = 0
-        sum_capacity = 0
-        for id_ in self.container.container_list:
-            sum_level = self.container.get_level(id_)
-            sum_capacity = self.container.get_capacity(id_)
-        fill_degree = sum_level / sum_capacity
-        return self.compute_v(fill_degree)
+        # the total level divided by the total capacity of all containers
+        return self.compute_v(self.container.get_fill_degree())
 
 
 class Routable(Movable, Locatable):
     """Mixin class: Something with a route (networkx node list format)
-    route: a list of node ids (available on env.graph) or geometries (shapely.Geometry)
+    route: a list of node ids (available on env.FG) or geometries (shapely.Geometry)
+
+    A Routable that is located on a node of the graph env.FG sails to a
+    destination that is located on a node over the shortest path in the graph,
+    see RouteNetwork. The functions in on_pass_edge_functions are called
+    (and yielded) after every edge that is passed.
     """
 
     # one instance on the class
 
-    def __init__(self, route: list, *args, **kwargs):
+    def __init__(self, route: Optional[list] = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # call functions when passing edges
         self.route = route
@@ -200,12 +233,57 @@ class Routable(Movable, Locatable):
 
         assert hasattr(self.env, "FG"), "expected graph FG to be available on env"
 
+    @property
+    def network(self):
+        """The RouteNetwork of the graph env.FG."""
+        return get_route_network(self.env)
+
+    def move(
+        self,
+        destination: Optional[Locatable] = None,
+        duration: Optional[float] = None,
+        engine_order: Optional[float] = None,
+    ):
+        """Sail over the shortest path to the destination.
+
+        If the duration is given, or the Routable or the destination is not
+        located on a node of the graph, this is the move of a Movable.
+        """
+        if (
+            destination is None
+            or duration is not None
+            or self.node not in self.network.graph
+            or getattr(destination, "node", None) not in self.network.graph
+        ):
+            yield from super().move(destination, duration, engine_order)
+            return
+
+        if engine_order is not None:
+            self.engine_order = engine_order
+
+        self.log_entry_v1(
+            self.env.now,
+            self.activity_id,
+            LogState.START,
+        )
+
+        self.route = self.network.shortest_path(self.node, destination.node)
+        yield from self.move_over_route(self.route)
+        self.geometry = shapely.geometry.shape(destination.geometry)
+
+        self.log_entry_v1(
+            self.env.now,
+            self.activity_id,
+            LogState.STOP,
+        )
+
     def move_to_geometry(self, geometry: shapely.geometry.Point):
         """move to geometry"""
-        linestring = shapely.geometry.LineString([self.geometry, geometry])
-        distance = WGS84.geometry_length(linestring)
-        duration = self.v * distance
-        yield self.env.timeout(duration)
+        distance = get_distance_cache(self.env).distance(self.geometry, geometry)
+        if distance > 0:
+            start_time = self.env.now
+            yield self.env.timeout(distance / self.v)
+            self._record_trip(start_time, self.env.now, self.geometry, geometry)
         self.geometry = geometry
 
     def pass_linestring(self, geometry: shapely.geometry.LineString):
@@ -214,9 +292,12 @@ class Routable(Movable, Locatable):
         b = shapely.geometry.Point(geometry.coords[-1])
         assert isinstance(geometry, shapely.geometry.LineString)
         distance = WGS84.geometry_length(geometry)
-        duration = distance / (self.v * self.engine_order)
+        # the speed v includes the engine order
+        duration = distance / self.v
         self.geometry = a
+        start_time = self.env.now
         yield self.env.timeout(duration)
+        self._record_trip(start_time, self.env.now, a, b)
         self.geometry = b
 
     @staticmethod
@@ -238,29 +319,49 @@ class Routable(Movable, Locatable):
 
     def move_over_route(self, route: List[str]):
         """sail over the route, a list of nodes"""
+        network = self.network
+        nodes = network.graph.nodes
         a = route[0]
-        a_geometry = self.graph.nodes[a]["geometry"]
+        a_geometry = nodes[a]["geometry"]
         yield from self.move_to_geometry(a_geometry)
         # move self to node + geometry
         self.node = a
         self.geometry = a_geometry
 
-        for i, (a, b) in enumerate(pairwise(route)):
-            a_geometry = self.graph[a]["geometry"]
-            b_geometry = self.graph[b]["geometry"]
-            edge_geometry = self.graph[(a, b)]["geometry"]
-            # make sure we are in the right order
-            edge_geometry = self.order_geometry(edge_geometry, a_geometry)
+        if not self.on_pass_edge_functions:
+            # nothing happens on the edges, pass the route in one go
+            v = self.v
+            duration = network.travel_time(route, v)
+            if duration > 0:
+                start_time = self.env.now
+                yield self.env.timeout(duration)
+                # record the edges as trips, with the times they were passed
+                for a, b in pairwise(route):
+                    end_time = start_time + network.edge_length(a, b) / v
+                    self._record_trip(
+                        start_time, end_time, nodes[a]["geometry"], nodes[b]["geometry"]
+                    )
+                    start_time = end_time
+            self.node = route[-1]
+            self.geometry = nodes[route[-1]]["geometry"]
+            return
+
+        for a, b in pairwise(route):
+            edge_geometry = network.edge_geometry(a, b)
             # go to a (we should already be here)
-            self.geometry = a_geometry
+            self.geometry = nodes[a]["geometry"]
             self.node = a
             # pass over the edge
-            yield from self.pass_linestring(edge_geometry)
+            start_time = self.env.now
+            yield self.env.timeout(network.edge_length(a, b) / self.v)
+            self._record_trip(
+                start_time, self.env.now, nodes[a]["geometry"], nodes[b]["geometry"]
+            )
             # call any other functions we have registered
-            for pass_edge_function in self.pass_edge_function:
+            for pass_edge_function in self.on_pass_edge_functions:
                 yield pass_edge_function(
                     movable=self, a=a, b=b, route=route, geometry=edge_geometry
                 )
             # we have arrived, go there....
-            self.geometry = b_geometry
+            self.geometry = nodes[b]["geometry"]
             self.node = b
@@ -0,0 +1,105 @@
+"""Routing over the network (graph) of the simulation environment."""
+import networkx as nx
+import numpy as np
+import shapely.geometry
+
+from .distance import WGS84
+
+
+class RouteNetwork:
+    """
+    Routing engine over a networkx graph, e.g. the graph env.FG.
+
+    The nodes of the graph have a (point) geometry. The edges can have a
+    geometry (linestring) and a length (m), the length is computed from the
+    geometry (or the straight line between the nodes) if it is not given.
+
+    The lengths of all edges are computed once, when the network is created.
+    The edge geometries (oriented in the direction of travel) and the
+    shortest paths between pairs of nodes are cached when first used, so the
+    graph should not change during the simulation.
+
+    Parameters
+    ----------
+    graph
+        networkx graph with a geometry for every node
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._lengths: dict = {}
+        self._geometries: dict = {}
+        self._paths: dict = {}
+
+        for a, b, data in graph.edges(data=True):
+            length = data.get("length")
+            if length is None:
+                length = WGS84.geometry_length(self._get_geometry(a, b, data))
+            self._lengths[(a, b)] = length
+            if not graph.is_directed():
+                self._lengths[(b, a)] = length
+
+    def _get_geometry(self, a, b, data):
+        geometry = data.get("geometry")
+        if geometry is None:
+            geometry = shapely.geometry.LineString(
+                [self.graph.nodes[a]["geometry"], self.graph.nodes[b]["geometry"]]
+            )
+        return geometry
+
+    def edge_length(self, a, b):
+        """Return the length (m) of the edge from a to b."""
+        return self._lengths[(a, b)]
+
+    def edge_geometry(self, a, b):
+        """Return the geometry of the edge from a to b, starting at a."""
+        geometry = self._geometries.get((a, b))
+        if geometry is None:
+            geometry = self._get_geometry(a, b, self.graph.edges[a, b])
+            start, end = geometry.coords[0], geometry.coords[-1]
+            a_geometry = self.graph.nodes[a]["geometry"]
+            _, _, distance_from_start = WGS84.inv(*start, a_geometry.x, a_geometry.y)
+            _, _, distance_from_end = WGS84.inv(*end, a_geometry.x, a_geometry.y)
+            if distance_from_start > distance_from_end:
+                coords = np.flipud(np.array(geometry.coords))
+                geometry = shapely.geometry.LineString(coords)
+            self._geometries[(a, b)] = geometry
+        return geometry
+
+    def route_length(self, route):
+        """Return the length (m) of a route, a list of nodes."""
+        lengths = self._lengths
+        return sum(lengths[(a, b)] for a, b in zip(route[:-1], route[1:]))
+
+    def travel_time(self, route, v):
+        """Return the time (s) to travel a route with speed v (m/s)."""
+        return self.route_length(route) / v
+
+    def shortest_path(self, origin, destination):
+        """Return the shortest route (list of nodes) from origin to destination."""
+        path = self._paths.get((origin, destination))
+        if path is None:
+            lengths = self._lengths
+            path = nx.shortest_path(
+                self.graph,
+                origin,
+                destination,
+                weight=lambda a, b, data: lengths[(a, b)],
+            )
+            self._paths[(origin, destination)] = path
+        return list(path)
+
+
+def get_route_network(env):
+    """
+    Return the RouteNetwork of the graph env.FG.
+
+    The network is created on first use and recreated when env.FG is
+    replaced by another graph.
+    """
+    assert hasattr(env, "FG"), "expected graph FG to be available on env"
+    network = getattr(env, "route_network", None)
+    if network is None or network.graph is not env.FG:
+        network = RouteNetwork(env.FG)
+        env.route_network = network
+    return network
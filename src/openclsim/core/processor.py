@@ -8,6 +8,10 @@ from .simpy_object import SimpyObject
 
 logger = logging.getLogger(__name__)
 
+# levels within this margin are considered equal, to allow for the rounding of
+# the (fractional) amounts that are added to and taken from the containers
+LEVEL_TOLERANCE = 1e-9
+
 
 class Processor(SimpyObject):
     """
@@ -88,6 +92,72 @@ class Processor(SimpyObject):
                 activity_state=LogState.STOP,
             )
 
+    def process_bundle(
+        self,
+        origin,
+        destination,
+        amounts,
+        duration,
+        reserved_amounts,
+    ):
+        """
+        Move a bundle of amounts (by container id) from origin to destination.
+
+        The whole bundle is processed as a single shift: it takes duration and
+        the amounts are moved in one atomic transfer (see
+        EventsContainer.transfer) at the end of it.
+        """
+
+        assert isinstance(origin, HasContainer)
+        assert isinstance(destination, HasContainer)
+        assert isinstance(self, Log)
+        assert isinstance(origin, Log)
+        assert isinstance(destination, Log)
+        assert self.is_at(origin)
+        assert destination.is_at(origin)
+
+        # Log the process for all parts
+        for location in set([self, origin, destination]):
+            location.log_entry_v1(
+                t=location.env.now,
+                activity_id=self.activity_id,
+                activity_state=LogState.START,
+            )
+
+        yield self.env.timeout(duration, value=self.activity_id)
+
+        start_time = self.env.now
+        while not origin.container.can_transfer(destination.container, amounts):
+            yield origin.container.get_transfer_event(destination.container, amounts)
+        origin.container.transfer(
+            destination.container, amounts, reserved_amounts=reserved_amounts
+        )
+        end_time = self.env.now
+
+        # If the bundle could not be transferred directly, log waiting
+        if start_time != end_time:
+            for activity_state, t in [
+                (LogState.WAIT_START, start_time),
+                (LogState.WAIT_STOP, end_time),
+            ]:
+                self.log_entry_v1(
+                    t=t,
+                    activity_id=self.activity_id,
+                    activity_state=activity_state,
+                    activity_label={
+                        "type": "subprocess",
+                        "ref": f"waiting {origin.name} and {destination.name}",
+                    },
+                )
+
+        # Log the process for all parts
+        for location in set([self, origin, destination]):
+            location.log_entry_v1(
+                t=location.env.now,
+                activity_id=self.activity_id,
+                activity_state=LogState.STOP,
+            )
+
     def check_possible_shift(
         self, origin, destination, amount, activity, reserved_amount, id_="default"
     ):
@@ -95,24 +165,34 @@ class Processor(SimpyObject):
         Check if all the material is available.
 
         If the amount is not available in the origin or in the destination,
-        yield a put or get. Time will move forward until the amount can be
-        retrieved from the origin or placed into the destination.
+        yield a container event. Time will move forward until the amount can be
+        retrieved from the origin or placed into the destination. The levels
+        are then changed directly, without scheduling events. The levels are
+        compared with a tolerance (LEVEL_TOLERANCE) for rounding errors.
         """
         obj_map = {"get": origin, "put": destination}
         obj = obj_map[activity]
-        method = getattr(obj.container, activity)
+        container = obj.container
 
         start_time = self.env.now
+        if activity == "get":
+            while amount - container.get_level(id_) > LEVEL_TOLERANCE:
+                yield container.get_container_event(
+                    level=amount - LEVEL_TOLERANCE, operator="ge", id_=id_
+                )
+            sign = -1
+        else:
+            capacity = container.get_capacity(id_)
+            while container.get_level(id_) + amount - capacity > LEVEL_TOLERANCE:
+                yield container.get_container_event(
+                    level=capacity - amount + LEVEL_TOLERANCE, operator="le", id_=id_
+                )
+            sign = 1
+
         # Shift amounts in containers
-        yield method(
-            amount,
-            id_,
-        )
+        container.change_level(sign * amount, id_)
         # Correct the container reservation with the actual amount
-        yield method(
-            amount - reserved_amount,
-            f"{id_}_reservations",
-        )
+        container.change_level(sign * (amount - reserved_amount), f"{id_}_reservations")
         end_time = self.env.now
 
         # If the amount is not available in the origin, log waiting
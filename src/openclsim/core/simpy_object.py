@@ -12,5 +12,6 @@ class SimpyObject:
     """
 
     def __init__(self, env, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # set first, so the env is available to the mixins that follow
         self.env = env
+        super().__init__(*args, **kwargs)
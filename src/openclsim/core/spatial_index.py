@@ -0,0 +1,199 @@
+"""Spatial index over the Locatable objects of the simulation environment."""
+import numpy as np
+import shapely
+import shapely.geometry
+
+from .distance import DISTANCE_METHODS
+
+# lower bounds of the length (m) of a degree of latitude and of longitude at
+# the equator, on the WGS84 ellipsoid (110574 and 111319) and on the sphere of
+# the haversine distance (111195), so the search boxes are large enough
+_METERS_PER_DEGREE = 110574.0
+_METERS_PER_DEGREE_LON = 111000.0
+
+
+def _coordinates(geometry):
+    """Return the lon, lat of a geometry (the centroid of non point geometries)."""
+    geometry = shapely.geometry.shape(geometry)
+    if not isinstance(geometry, shapely.geometry.Point):
+        geometry = geometry.centroid
+    return geometry.x, geometry.y
+
+
+class SpatialIndex:
+    """
+    Spatial index over Locatable objects, backed by a shapely STRtree.
+
+    The Locatables of an environment are added to its index when the index is
+    enabled (see get_spatial_index). The tree is built on the lon, lat of the
+    objects (the centroid of non point geometries) when it is queried, it is
+    only rebuilt when objects are added. Objects that change their geometry
+    (e.g. a Movable that arrives at a site) are taken out of the tree: they
+    are kept in a list of moving objects, of which the distances are computed
+    at every query. So the tree holds the static objects (e.g. the sites) and
+    the moving objects do not cause a rebuild.
+
+    The queries find the candidates in the tree in logarithmic time, with a
+    bounding box that is large enough for the given distance, and compute the
+    distances of the candidates and of the moving objects only.
+
+    Parameters
+    ----------
+    method
+        the distance backend, see DISTANCE_METHODS
+    """
+
+    def __init__(self, method="geodesic"):
+        self.objects: list = []
+        self.method = method
+        self._compute = DISTANCE_METHODS[method]
+        self._tree = None
+        self._coords = np.empty((0, 2))
+        # position of the objects in objects, by id
+        self._positions: dict = {}
+        # positions of the objects that changed their geometry (as keys)
+        self._moving: dict = {}
+        self._is_moving = np.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def add(self, locatable):
+        """Add a Locatable to the index."""
+        self._positions[id(locatable)] = len(self.objects)
+        self.objects.append(locatable)
+        self._tree = None
+
+    def update(self, locatable):
+        """Mark the Locatable as moving, it changed its geometry."""
+        i = self._positions.get(id(locatable))
+        if i is None or i in self._moving:
+            return
+        self._moving[i] = None
+        if self._tree is not None:
+            self._is_moving[i] = True
+
+    def _build(self):
+        if self._tree is None:
+            self._coords = np.array(
+                [_coordinates(obj.geometry) for obj in self.objects], dtype=float
+            ).reshape(-1, 2)
+            self._tree = shapely.STRtree(shapely.points(self._coords))
+            self._is_moving = np.zeros(len(self.objects), dtype=bool)
+            self._is_moving[list(self._moving)] = True
+        return self._tree
+
+    def _within(self, x, y, radius):
+        """Return the indices and distances of the objects within radius of x, y."""
+        tree = self._build()
+        dlat = radius / _METERS_PER_DEGREE
+        max_lat = abs(y) + dlat
+        if max_lat < 90:
+            dlon = radius / (_METERS_PER_DEGREE_LON * np.cos(np.radians(max_lat)))
+        if max_lat >= 90 or x - dlon < -180 or x + dlon > 180:
+            # the box wraps around the pole or the antimeridian
+            box = shapely.box(-180, y - dlat, 180, y + dlat)
+        else:
+            box = shapely.box(x - dlon, y - dlat, x + dlon, y + dlat)
+        indices = tree.query(box)
+        indices = indices[~self._is_moving[indices]]
+        coords = self._coords[indices]
+
+        if self._moving:
+            # the moving objects are not in the tree, use their geometry now
+            moving = np.array(list(self._moving))
+            moving_coords = np.array(
+                [_coordinates(self.objects[i].geometry) for i in self._moving],
+                dtype=float,
+            )
+            indices = np.concatenate([indices, moving])
+            coords = np.concatenate([coords, moving_coords])
+        order = np.argsort(indices)
+        indices = indices[order]
+        coords = coords[order]
+
+        distances = self._compute(
+            np.full(len(indices), x),
+            np.full(len(indices), y),
+            coords[:, 0],
+            coords[:, 1],
+        )
+        distances = np.asarray(distances, dtype=float)
+        keep = distances <= radius
+        return indices[keep], distances[keep]
+
+    def query_radius(self, geometry, radius, where=None):
+        """
+        Return the objects within radius (m) of geometry, nearest first.
+
+        Parameters
+        ----------
+        geometry
+            the (point) geometry to search around
+        radius
+            the search radius in m
+        where
+            optional function, only the objects for which it returns True
+            are returned
+        """
+        x, y = _coordinates(geometry)
+        indices, distances = self._within(x, y, radius)
+        order = np.argsort(distances, kind="stable")
+        objects = [self.objects[i] for i in indices[order].tolist()]
+        if where is not None:
+            objects = [obj for obj in objects if where(obj)]
+        return objects
+
+    def at(self, geometry, tolerance=100):
+        """Return the objects at geometry, like Locatable.is_at."""
+        x, y = _coordinates(geometry)
+        indices, distances = self._within(x, y, tolerance)
+        return [self.objects[i] for i in indices[distances < tolerance].tolist()]
+
+    def nearest(self, geometry, where=None):
+        """
+        Return the object nearest to geometry, None if there is none.
+
+        Parameters
+        ----------
+        geometry
+            the (point) geometry to search from
+        where
+            optional function, only the objects for which it returns True
+            are considered
+        """
+        tree = self._build()
+        if not len(self.objects):
+            return None
+        x, y = _coordinates(geometry)
+
+        # the nearest object in lon, lat bounds the distance to search
+        i = tree.nearest(shapely.Point(x, y))
+        radius = float(self._compute(x, y, *self._coords[i])) or 1.0
+        while True:
+            indices, distances = self._within(x, y, radius)
+            for j in np.argsort(distances, kind="stable").tolist():
+                obj = self.objects[indices[j]]
+                if where is None or where(obj):
+                    return obj
+            if len(indices) == len(self.objects):
+                return None
+            radius *= 2
+
+
+def get_spatial_index(env):
+    """
+    Return the SpatialIndex of the environment, None if it is not enabled.
+
+    The index is enabled by setting the ``spatial_index`` attribute of the
+    environment to True (or to a SpatialIndex) before the objects are
+    created, it is created on first use. The index uses the
+    ``distance_method`` of the environment.
+    """
+    index = getattr(env, "spatial_index", None)
+    if index is True:
+        index = SpatialIndex(method=getattr(env, "distance_method", "geodesic"))
+        env.spatial_index = index
+    if not isinstance(index, SpatialIndex):
+        return None
+    return index
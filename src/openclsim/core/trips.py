@@ -0,0 +1,118 @@
+"""Compact record of the trips of the moving simulation objects."""
+import numpy as np
+import shapely.geometry
+
+from .distance import WGS84
+from .log_store import _grow
+
+
+def _point(geometry):
+    """Return the geometry as shapely Point (the centroid of other geometries)."""
+    geometry = shapely.geometry.shape(geometry)
+    if not isinstance(geometry, shapely.geometry.Point):
+        geometry = geometry.centroid
+    return geometry
+
+
+def _interpolate(lon1, lat1, lon2, lat2, fraction):
+    """Return the lon, lat at fraction of the great circle paths, vectorized."""
+    if len(lon1) == 1:
+        # pyproj converts arrays of a single point to scalars (deprecated)
+        az12, _, distance = WGS84.inv(lon1[0], lat1[0], lon2[0], lat2[0])
+        lon, lat, _ = WGS84.fwd(lon1[0], lat1[0], az12, distance * fraction[0])
+        return np.array([lon]), np.array([lat])
+    az12, _, distance = WGS84.inv(lon1, lat1, lon2, lat2)
+    lon, lat, _ = WGS84.fwd(lon1, lat1, az12, distance * fraction)
+    return lon, lat
+
+
+class TripLog:
+    """
+    Trip segments of a moving object, stored in NumPy arrays.
+
+    Every segment has a start time, an end time and the coordinates (lon,
+    lat) of its origin and destination. The segments are appended in time
+    order, the position at any time is interpolated along the great circle
+    of the segment. Non point geometries (e.g. the polygon of a site) are
+    recorded by their centroid.
+
+    Parameters
+    ----------
+    geometry
+        the (point) geometry of the object before the first trip
+    """
+
+    def __init__(self, geometry):
+        point = _point(geometry)
+        self.initial = (point.x, point.y)
+        self._size = 0
+        self._times = np.empty((16, 2))
+        self._coordinates = np.empty((16, 4))
+
+    def __len__(self):
+        return self._size
+
+    def append(self, start, end, origin, destination):
+        """Append a trip from origin to destination (geometries) from start to end."""
+        origin = _point(origin)
+        destination = _point(destination)
+        self._times = _grow(self._times, self._size + 1)
+        self._coordinates = _grow(self._coordinates, self._size + 1)
+        self._times[self._size] = start, end
+        self._coordinates[self._size] = origin.x, origin.y, destination.x, destination.y
+        self._size += 1
+
+    def repeat(self, first, cycles, period):
+        """
+        Repeat the segments from row first on, e.g. the trips of a cycle.
+
+        The segments are appended cycles times, every time shifted by period
+        (s) in time.
+        """
+        times = self.times[first:]
+        coordinates = self.coordinates[first:]
+        shifts = np.repeat(np.arange(1, cycles + 1) * period, len(times))
+        size = self._size + cycles * len(times)
+        self._times = _grow(self._times, size)
+        self._coordinates = _grow(self._coordinates, size)
+        self._times[self._size : size] = np.tile(times, (cycles, 1)) + shifts[:, None]
+        self._coordinates[self._size : size] = np.tile(coordinates, (cycles, 1))
+        self._size = size
+
+    @property
+    def times(self):
+        """Return the start and end times of the segments, an array (n, 2)."""
+        return self._times[: self._size]
+
+    @property
+    def coordinates(self):
+        """Return the origin and destination lon, lat of the segments (n, 4)."""
+        return self._coordinates[: self._size]
+
+    def positions_at(self, times):
+        """Return the positions (lon, lat) at the given times, an array (n, 2)."""
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        positions = np.empty((len(times), 2))
+        positions[:] = self.initial
+
+        # the last segment that started at (or before) every time
+        segments = np.searchsorted(self.times[:, 0], times, side="right") - 1
+        started = segments >= 0
+        segment_times = self.times[segments[started]]
+        coordinates = self.coordinates[segments[started]]
+        times = times[started]
+        start, end = segment_times[:, 0], segment_times[:, 1]
+        positions[started] = np.where(
+            (times == start)[:, None], coordinates[:, :2], coordinates[:, 2:]
+        )
+
+        moving = (start < times) & (times < end)
+        if np.any(moving):
+            fraction = (times[moving] - start[moving]) / (end - start)[moving]
+            lon, lat = _interpolate(*coordinates[moving].T, fraction)
+            positions[np.flatnonzero(started)[moving]] = np.column_stack([lon, lat])
+        return positions
+
+    def position_at(self, t):
+        """Return the position at time t as shapely Point."""
+        return shapely.geometry.Point(*self.positions_at([t])[0])
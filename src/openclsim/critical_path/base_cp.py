@@ -7,12 +7,14 @@ the critical path of the simulation
 import uuid
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 
+import openclsim.core as core
 from openclsim.critical_path.simulation_graph import SimulationGraph
 from openclsim.model import get_subprocesses
-from openclsim.plot.log_dataframe import get_log_dataframe
+from openclsim.plot.log_dataframe import get_log_dataframe, replace_ids
 from openclsim.plot.vessel_planning import add_layout_gantt_chart, get_colors
 
 
@@ -20,6 +22,10 @@ class BaseCP(ABC):
     """
     Base class for critical path
 
+    The critical path is derived from the WAIT entries and the entries of the
+    sub processes in the logs, so all objects and activities should log at
+    LogLevel FULL (the default).
+
     Parameters
     ------------
     env : simpy.Environment
@@ -69,9 +75,15 @@ class BaseCP(ABC):
     def _make_recorded_activities_df(self):
         """
         Set a recorded_activity_df in self.
-        Uses the logs of provided activities and sim objects, combines these, adds unique UUID
+        Uses the logs of provided activities and sim objects, combines these, adds unique id
         and reshape into format such that single row has a start time and an end time.
         """
+        core.check_log_level(
+            [*self.object_list, *get_subprocesses(self.activity_list)],
+            core.LogLevel.FULL,
+            "The critical path",
+        )
+
         # get all recorded events through logs simulation objects (excl plugins)
         all_recorded_events_objects = self.combine_logs()
 
@@ -104,16 +116,30 @@ class BaseCP(ABC):
         if not len(names) == len(set(names)):
             raise ValueError("Names of your objects must be unique!")
 
-        # concat logs with name and keep only columns needed
-        log_list = [get_log_dataframe(obj) for obj in self.object_list]
-        names_column = (
-            pd.Series(names, name="SimulationObject")
-            .repeat([len(df) for df in log_list])
-            .reset_index(drop=True)
-        )
-        log_all = pd.concat(
-            [names_column, pd.concat(log_list).reset_index(drop=True)], axis=1
-        )
+        journal = getattr(self.env, "event_journal", None)
+        if (
+            journal is not None
+            and journal.contains(self.object_list)
+            and not journal.store.has_records
+        ):
+            # the journal holds the entries of all objects in time order
+            log_all = journal.get_dataframe(self.object_list).rename(
+                columns={"Object": "SimulationObject", "ActivityID": "Activity"}
+            )
+        else:
+            # concat logs with name and sort by time
+            log_list = [get_log_dataframe(obj) for obj in self.object_list]
+            names_column = (
+                pd.Series(names, name="SimulationObject")
+                .repeat([len(df) for df in log_list])
+                .reset_index(drop=True)
+            )
+            log_all = pd.concat(
+                [names_column, pd.concat(log_list).reset_index(drop=True)], axis=1
+            )
+            log_all = log_all.sort_values("Timestamp").reset_index(drop=True)
+
+        # keep only columns needed
         log_all = log_all[
             ["Activity", "Timestamp", "ActivityState", "SimulationObject"]
         ]
@@ -122,9 +148,9 @@ class BaseCP(ABC):
         list_all_activities = get_subprocesses(self.activity_list)
         id_map = {act.id: act.name for act in list_all_activities}
         log_all["ActivityID"] = log_all["Activity"]
-        log_all["Activity"] = log_all["Activity"].replace(id_map)
+        log_all["Activity"] = replace_ids(log_all["Activity"], id_map)
 
-        return log_all.sort_values("Timestamp").reset_index(drop=True)
+        return log_all
 
     @staticmethod
     def get_log_dataframe_activity(activity_list):
@@ -231,7 +257,8 @@ class BaseCP(ABC):
         log. For the analysis of the critical path of executed activities, it is
         desired to make the distinction between _activity A_ starting at time _t1_,
         and the same _activity A_ starting at time _t2_. This new ID is added as
-        an additional column in the provided log as ``cp_activity_id``.
+        an additional column in the provided log as ``cp_activity_id`` (a UUID
+        string).
 
         Parameters
         -----------
@@ -243,21 +270,17 @@ class BaseCP(ABC):
         recorded_activities_df : pd.DataFrame
             As input, with additional column `cp_activity_id`.
         """
-        # add unique identifier (count) based on activity ID and time, and then set to UUID
+        # add unique identifier (count) based on activity ID and time, and then
+        # set to a UUID (one per unique identifier)
+        codes, uniques = recorded_activities_df.set_index(
+            ["ActivityID", "start_time", "end_time"]
+        ).index.factorize()
+        uuids = np.array([str(uuid.uuid4()) for _ in range(len(uniques))], dtype=object)
         recorded_activities_df.insert(
             loc=len(recorded_activities_df.columns),
             column="cp_activity_id",
-            value=recorded_activities_df.set_index(
-                ["ActivityID", "start_time", "end_time"]
-            ).index.factorize()[0],
+            value=uuids[codes],
         )
-        mapping = {
-            temp_id: str(uuid.uuid4())
-            for temp_id in recorded_activities_df["cp_activity_id"]
-        }
-        recorded_activities_df["cp_activity_id"] = recorded_activities_df[
-            "cp_activity_id"
-        ].apply(lambda x: mapping[x])
 
         return recorded_activities_df
 
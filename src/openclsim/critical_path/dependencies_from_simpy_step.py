@@ -122,11 +122,12 @@ class DependenciesFromSimpy(BaseCP):
 
         # get recorded activities and convert times to floats (seconds since Jan 1970)
         recorded_activities_df = self.recorded_activities_df.copy()
+        epoch = pd.Timestamp(0)
         recorded_activities_df.start_time = round(
-            recorded_activities_df.start_time.astype("int64") / 10**9, 4
+            (recorded_activities_df.start_time - epoch).dt.total_seconds(), 4
         )
         recorded_activities_df.end_time = round(
-            recorded_activities_df.end_time.astype("int64") / 10**9, 4
+            (recorded_activities_df.end_time - epoch).dt.total_seconds(), 4
         )
 
         # rename the dependencies from dependencies with e_id to dependencies with cp_activity_id
@@ -2,6 +2,7 @@
 
 from .base_activities import AbstractPluginClass, GenericActivity, PluginActivity
 from .basic_activity import BasicActivity
+from .condition import Condition, compile_expression, get_expression_stats
 from .helpers import get_subprocesses, register_processes
 from .move_activity import MoveActivity
 from .parallel_activity import ParallelActivity
@@ -13,7 +14,10 @@ from .while_activity import RepeatActivity, WhileActivity
 __all__ = [
     "AbstractPluginClass",
     "BasicActivity",
+    "compile_expression",
+    "Condition",
     "GenericActivity",
+    "get_expression_stats",
     "get_subprocesses",
     "MoveActivity",
     "ParallelActivity",
@@ -2,10 +2,10 @@
 
 from abc import ABC
 
-import simpy
-
 import openclsim.core as core
 
+from .condition import compile_expression
+
 
 class AbstractPluginClass(ABC):
     """
@@ -13,8 +13,15 @@ class AbstractPluginClass(ABC):
     plugin for a specific Activity.
 
     Instance checks will be performed on this class level.
+
+    The pre_process and post_process functions of a plugin return a generator
+    (which is run as part of the activity process) or {} if the activity does
+    not have to wait. A plugin that never waits can set synchronous to True,
+    its functions are then called without running their result.
     """
 
+    synchronous = False
+
     def __init__(self):
         pass
 
@@ -75,6 +82,10 @@ class PluginActivity(core.Identifiable, core.Log):
     The plugin mechanism foresees that the plugin function pre_process is called before
     the activity is executed, while the function post_process is called after the
     activity has been executed.
+
+    The plugins are called in the order of their priority. Without plugins, or
+    with synchronous plugins only, pre_process and post_process return an empty
+    tuple, so no generator is created for them.
     """
 
     def __init__(self, *args, **kwargs):
@@ -82,18 +93,36 @@ class PluginActivity(core.Identifiable, core.Log):
         self.plugins = list()
 
     def register_plugin(self, plugin, priority=0):
-        self.plugins.append({"priority": priority, "plugin": plugin})
-        self.plugins = sorted(self.plugins, key=lambda x: x["priority"])
+        # insert after the plugins with the same or a lower priority
+        i = len(self.plugins)
+        while i > 0 and self.plugins[i - 1]["priority"] > priority:
+            i -= 1
+        self.plugins.insert(i, {"priority": priority, "plugin": plugin})
 
     def pre_process(self, args_data):
-        # iterating over all registered plugins for this activity calling pre_process
-        for item in self.plugins:
-            yield from item["plugin"].pre_process(**args_data)
+        # calling pre_process of all registered plugins for this activity
+        return self._dispatch("pre_process", (), args_data)
 
     def post_process(self, *args, **kwargs):
-        # iterating over all registered plugins for this activity calling post_process
+        # calling post_process of all registered plugins for this activity
+        return self._dispatch("post_process", args, kwargs)
+
+    def _dispatch(self, name, args, kwargs):
+        """Call the plugin functions, return what should be yielded from."""
+        if not self.plugins:
+            return ()
+        if all(getattr(item["plugin"], "synchronous", False) for item in self.plugins):
+            for item in self.plugins:
+                getattr(item["plugin"], name)(*args, **kwargs)
+            return ()
+        return self._run_plugins(name, args, kwargs)
+
+    def _run_plugins(self, name, args, kwargs):
         for item in self.plugins:
-            yield from item["plugin"].post_process(*args, **kwargs)
+            result = getattr(item["plugin"], name)(*args, **kwargs)
+            if getattr(item["plugin"], "synchronous", False) or not result:
+                continue
+            yield from result
 
     def delay_processing(self, env, activity_label, activity_log, waiting):
         activity_log.log_entry_v1(
@@ -135,8 +164,33 @@ class GenericActivity(PluginActivity):
         self.requested_resources = requested_resources
         self.keep_resources = keep_resources
         self.done_event = self.env.event()
+        # compiled expressions by attribute name and by sub process name
+        self._conditions: dict = {}
+        self._done_conditions: dict = {}
+        # long lived process of the activity and the signal to run it again
+        self._runner = None
+        self._restart = None
+
+    def _is_top_level(self):
+        # sub processes get a start event from their parent
+        return not hasattr(self, "start_event_parent")
+
+    def register_process(self, reuse=False):
+        """
+        Add the activity to the simpy environment.
+
+        Parameters
+        ----------
+        reuse
+            run the activity again in its long lived process (see
+            _restart_process) instead of a new simpy process. The activity
+            should be registered before and done. Only the simpy process is
+            reused: the events are replaced and the container reservations
+            are made again, like for a new process.
+        """
+        # the activity could have become a sub process since it was created
+        self._update_log_threshold()
 
-    def register_process(self):
         # replace the events
         self.done_event = self.env.event()
         if hasattr(self, "start_sequence") and self.start_sequence.processed:
@@ -148,6 +202,11 @@ class GenericActivity(PluginActivity):
         if hasattr(self, "make_container_reservation"):
             self.make_container_reservation()
 
+        if reuse:
+            # the activity is in the registry already
+            self._restart_process()
+            return
+
         # add the activity with start event to the simpy environment
         self.main_process = self.env.process(
             self.delayed_process(activity_log=self, env=self.env)
@@ -157,74 +216,73 @@ class GenericActivity(PluginActivity):
         self.registry.setdefault("name", {}).setdefault(self.name, set()).add(self)
         self.registry.setdefault("id", {}).setdefault(self.id, set()).add(self)
 
+    def _restart_process(self):
+        """
+        Run the activity again in its long lived process.
+
+        The done_event of the run takes the place of the simpy process as
+        main_process. The process is created on the first restart, after that
+        it waits for the restart event after every run. The restart event is
+        a plain simpy event, it is processed with normal priority (a new
+        process is started with urgent priority).
+
+        The container reservations of the run are made by register_process,
+        before the restart, like those of a new process. When the loop is done
+        the process keeps waiting for a restart that never comes, it does not
+        hold resources and is dropped with the environment. If a run fails,
+        the process ends and done_event fails with the exception, the next
+        restart creates a new process.
+        """
+        self.main_process = self.done_event
+        if self._restart is None or self._restart.triggered:
+            self._runner = self.env.process(self._run_process())
+        else:
+            self._restart.succeed()
+
+    def _run_process(self):
+        """Return the generator of the long lived process, see _restart_process."""
+        while True:
+            done = self.done_event
+            try:
+                value = yield from self.delayed_process(activity_log=self, env=self.env)
+            except Exception as exception:
+                self._restart = None
+                done.fail(exception)
+                return
+            self._restart = self.env.event()
+            done.succeed(value)
+            yield self._restart
+
     def parse_expression(self, expr):
-        if isinstance(expr, simpy.Event):
-            return expr
-        if isinstance(expr, list):
-            return self.env.all_of([self.parse_expression(item) for item in expr])
-        if isinstance(expr, dict):
-            if "and" in expr:
-                return self.env.all_of(
-                    [self.parse_expression(item) for item in expr["and"]]
-                )
-            if "or" in expr:
-                return self.env.any_of(
-                    [self.parse_expression(item) for item in expr["or"]]
-                )
-            if expr.get("type") == "container":
-                id_ = expr.get("id_", "default")
-                obj = expr["concept"]
-
-                if (
-                    expr.get("state") in ["gt", "ge", "lt", "le"]
-                    and expr.get("level") is not None
-                ):
-                    return obj.container.get_container_event(
-                        level=expr["level"],
-                        operator=expr["state"],
-                        id_=id_,
-                    )
-                elif expr["state"] == "full":
-                    return obj.container.get_full_event(id_=id_)
-                elif expr["state"] == "empty":
-                    return obj.container.get_empty_event(id_=id_)
-                raise ValueError
-
-            if expr.get("type") == "activity":
-                if expr.get("state") != "done":
-                    raise ValueError(
-                        f"Unknown state {expr.get('state')} in ActivityExpression."
-                    )
-                key = expr.get("ID", expr.get("name"))
-
-                activity_ = None
-
-                activity_from_id = self.registry.get("id", {}).get(key)
-                activity_from_name = self.registry.get("name", {}).get(key)
-                if activity_from_id is not None:
-                    activity_ = activity_from_id
-                elif activity_from_name is not None:
-                    activity_ = activity_from_name
-                else:
-                    raise Exception(
-                        f"No activity found in ActivityExpression for id/name {key} in expression {expr}\n"
-                        f"registry by name:\n{self.registry.get('name')}\n"
-                        f"registry by id:\n{self.registry.get('id')}\n"
-                    )
-
-                return self.env.all_of(
-                    [activity_item.main_process for activity_item in activity_]
-                )
+        """Return a new simpy event for the expression, see compile_expression."""
+        return compile_expression(self, expr).event()
 
-            if expr.get("type") == "time":
-                start = expr.get("start_time")
-                return self.env.timeout(max(start - self.env.now, 0), value=self.id)
-            raise ValueError
+    def get_condition(self, attribute):
+        """
+        Return the compiled expression of an attribute (e.g. "start_event").
 
-        raise ValueError(
-            f"{type(expr)} is not a valid input type. Valid input types "
-            "are: simpy.Event, dict, and list"
-        )
+        The expression is compiled on first use, and again only when the
+        attribute is set to an expression that is not equal to it (e.g. when the
+        sub processes are registered again for the next cycle of a loop).
+        """
+        expr = getattr(self, attribute)
+        cached = self._conditions.get(attribute)
+        if cached is None or not (cached[0] is expr or cached[0] == expr):
+            cached = self._conditions[attribute] = (
+                expr,
+                compile_expression(self, expr),
+            )
+        return cached[1]
+
+    def get_done_condition(self, sub_process):
+        """Return the compiled expression that the sub_process is done."""
+        condition = self._done_conditions.get(sub_process.name)
+        if condition is None:
+            condition = compile_expression(
+                self, {"type": "activity", "state": "done", "name": sub_process.name}
+            )
+            self._done_conditions[sub_process.name] = condition
+        return condition
 
     def delayed_process(
         self,
@@ -236,11 +294,11 @@ class GenericActivity(PluginActivity):
         start_event = (
             None
             if self.start_event is None
-            else self.parse_expression(self.start_event)
+            else self.get_condition("start_event").event()
         )
 
         if hasattr(self, "start_event_parent"):
-            yield self.parse_expression(self.start_event_parent)
+            yield self.get_condition("start_event_parent").event()
 
         start_time = env.now
         if start_event is not None:
@@ -0,0 +1,253 @@
+"""Compiled expressions for the start and condition events of the activities."""
+import operator as py_opp
+
+import simpy
+
+
+def get_expression_stats(env):
+    """
+    Return the counters of the expressions of the environment.
+
+    The counters are: compiled (expressions compiled into a Condition),
+    events (simpy events created by the conditions) and polls (conditions
+    checked without creating events). They are created on first use.
+    """
+    stats = getattr(env, "expression_stats", None)
+    if stats is None:
+        stats = {"compiled": 0, "events": 0, "polls": 0}
+        env.expression_stats = stats
+    return stats
+
+
+class Condition:
+    """
+    Expression of the expression language, compiled for an activity.
+
+    The expression is parsed once: the activities it refers to are looked up
+    in the registry and the containers are resolved. The condition then
+    creates fresh simpy events for the expression (event) or checks it
+    without creating events (poll).
+    """
+
+    def __init__(self, activity):
+        self.activity = activity
+        self.env = activity.env
+        self._stats = get_expression_stats(self.env)
+
+    def event(self):
+        """Return a new simpy event for the expression, like parse_expression."""
+        self._stats["events"] += 1
+        return self._event()
+
+    def poll(self):
+        """Return True if the condition is met now, without creating events."""
+        self._stats["polls"] += 1
+        return self._poll()
+
+    def is_processed(self):
+        """
+        Return True if the event of the condition is processed already.
+
+        Only a simpy event and the last event of a container level condition
+        are checked, the other conditions return a new (not yet processed)
+        event.
+        """
+        return False
+
+
+class EventCondition(Condition):
+    """Condition on a simpy event."""
+
+    def __init__(self, activity, event):
+        super().__init__(activity)
+        self._simpy_event = event
+
+    def _event(self):
+        return self._simpy_event
+
+    def _poll(self):
+        return self._simpy_event.processed
+
+    def is_processed(self):
+        return self._simpy_event.processed
+
+
+class AllOfCondition(Condition):
+    """Condition which is met when all its items are met."""
+
+    def __init__(self, activity, items):
+        super().__init__(activity)
+        self.items = items
+
+    def _event(self):
+        return self.env.all_of([item._event() for item in self.items])
+
+    def _poll(self):
+        return all(item._poll() for item in self.items)
+
+
+class AnyOfCondition(Condition):
+    """Condition which is met when any of its items is met."""
+
+    def __init__(self, activity, items):
+        super().__init__(activity)
+        self.items = items
+
+    def _event(self):
+        return self.env.any_of([item._event() for item in self.items])
+
+    def _poll(self):
+        return any(item._poll() for item in self.items)
+
+
+class ContainerCondition(Condition):
+    """Condition on the level of a container."""
+
+    def __init__(self, activity, container, state, level=None, id_="default"):
+        super().__init__(activity)
+        self.container = container
+        self.state = state
+        self.level = level
+        self.id_ = id_
+        self._last_event = None
+
+    def _get_level_operator(self):
+        if self.state == "full":
+            return self.container.get_capacity(self.id_), "ge"
+        if self.state == "empty":
+            return 0, "le"
+        return self.level, self.state
+
+    def _event(self):
+        if self.state == "full":
+            event = self.container.get_full_event(id_=self.id_)
+        elif self.state == "empty":
+            event = self.container.get_empty_event(id_=self.id_)
+        else:
+            event = self.container.get_container_event(
+                level=self.level, operator=self.state, id_=self.id_
+            )
+        self._last_event = event
+        return event
+
+    def _poll(self):
+        level, operator = self._get_level_operator()
+        return getattr(py_opp, operator)(self.container.get_level(self.id_), level)
+
+    def is_processed(self):
+        event = self._last_event
+        return event is not None and event.processed and self._poll()
+
+
+class ActivityCondition(Condition):
+    """Condition which is met when the activities (of an ID or name) are done."""
+
+    def __init__(self, activity, activities):
+        super().__init__(activity)
+        # the set of the registry, activities that are registered later with
+        # the same key are added to it
+        self.activities = activities
+
+    def _event(self):
+        return self.env.all_of(
+            [activity_item.main_process for activity_item in self.activities]
+        )
+
+    def _poll(self):
+        return all(
+            activity_item.main_process is not None
+            and activity_item.main_process.processed
+            for activity_item in self.activities
+        )
+
+
+class TimeCondition(Condition):
+    """Condition which is met at the start time."""
+
+    def __init__(self, activity, start_time):
+        super().__init__(activity)
+        self.start_time = start_time
+
+    def _event(self):
+        return self.env.timeout(
+            max(self.start_time - self.env.now, 0), value=self.activity.id
+        )
+
+    def _poll(self):
+        return self.env.now >= self.start_time
+
+
+def compile_expression(activity, expr):
+    """
+    Compile an expression of the expression language into a Condition.
+
+    Parameters
+    ----------
+    activity
+        the activity of the expression, the activities in the expression are
+        looked up in its registry
+    expr
+        a simpy event, a list of expressions (all of) or a dictionary
+    """
+    condition = _compile(activity, expr)
+    get_expression_stats(activity.env)["compiled"] += 1
+    return condition
+
+
+def _compile(activity, expr):
+    if isinstance(expr, simpy.Event):
+        return EventCondition(activity, expr)
+    if isinstance(expr, list):
+        return AllOfCondition(activity, [_compile(activity, item) for item in expr])
+    if isinstance(expr, dict):
+        if "and" in expr:
+            return AllOfCondition(
+                activity, [_compile(activity, item) for item in expr["and"]]
+            )
+        if "or" in expr:
+            return AnyOfCondition(
+                activity, [_compile(activity, item) for item in expr["or"]]
+            )
+        if expr.get("type") == "container":
+            id_ = expr.get("id_", "default")
+            container = expr["concept"].container
+
+            if (
+                expr.get("state") in ["gt", "ge", "lt", "le"]
+                and expr.get("level") is not None
+            ):
+                return ContainerCondition(
+                    activity, container, expr["state"], expr["level"], id_
+                )
+            elif expr["state"] in ["full", "empty"]:
+                return ContainerCondition(activity, container, expr["state"], id_=id_)
+            raise ValueError
+
+        if expr.get("type") == "activity":
+            if expr.get("state") != "done":
+                raise ValueError(
+                    f"Unknown state {expr.get('state')} in ActivityExpression."
+                )
+            key = expr.get("ID", expr.get("name"))
+            registry = activity.registry
+
+            activity_from_id = registry.get("id", {}).get(key)
+            activity_from_name = registry.get("name", {}).get(key)
+            if activity_from_id is not None:
+                return ActivityCondition(activity, activity_from_id)
+            elif activity_from_name is not None:
+                return ActivityCondition(activity, activity_from_name)
+            raise Exception(
+                f"No activity found in ActivityExpression for id/name {key} in expression {expr}\n"
+                f"registry by name:\n{registry.get('name')}\n"
+                f"registry by id:\n{registry.get('id')}\n"
+            )
+
+        if expr.get("type") == "time":
+            return TimeCondition(activity, expr.get("start_time"))
+        raise ValueError
+
+    raise ValueError(
+        f"{type(expr)} is not a valid input type. Valid input types "
+        "are: simpy.Event, dict, and list"
+    )
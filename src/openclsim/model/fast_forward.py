@@ -0,0 +1,286 @@
+"""Fast-forward of the steady cycles of the while activities."""
+import math
+
+import openclsim.core as core
+
+from .basic_activity import BasicActivity
+from .helpers import get_subprocesses
+from .move_activity import MoveActivity
+from .shift_amount_activity import ShiftAmountActivity
+
+# the activities of which a steady cycle can be skipped, next to the
+# structural activities (with sub processes)
+SUPPORTED_ACTIVITIES = (BasicActivity, MoveActivity, ShiftAmountActivity)
+
+
+def _relative(level, start):
+    """Return the (multi) container level relative to the level at the start."""
+    if isinstance(level, dict):
+        return {id_: value - start.get(id_, 0) for id_, value in level.items()}
+    return level - start.get("default", 0)
+
+
+def _absolute(level, start):
+    """Return the (multi) container level from the level relative to start."""
+    if isinstance(level, dict):
+        return {id_: value + start.get(id_, 0) for id_, value in level.items()}
+    return level + start.get("default", 0)
+
+
+def _safe_cycles(level, delta, excursion, operator, thresholds):
+    """
+    Return the number of cycles in which no level event is triggered.
+
+    The level changes by delta per cycle and by at most excursion within a
+    cycle, the thresholds are the sorted levels of the pending events of the
+    operator (see EventsContainer).
+    """
+    if operator in ["ge", "gt"]:
+        # the highest level reached must stay below the lowest threshold
+        margin = thresholds[0] - level - excursion
+        step = delta
+    else:
+        # the lowest level reached must stay above the highest threshold
+        margin = level - excursion - thresholds[-1]
+        step = -delta
+    strict = operator in ["ge", "le"]
+    if margin < 0 or (strict and margin == 0):
+        return 0
+    if step <= 0:
+        return math.inf
+    if strict:
+        return math.ceil(margin / step) - 1
+    return math.floor(margin / step)
+
+
+class SteadyCycles:
+    """
+    Detection and fast-forward of the steady cycles of a while activity.
+
+    At the end of every cycle the cycle is compared with the previous one.
+    The cycle is steady if it took the same time, the log entries of the
+    activities and objects are the same (relative to the start of the cycle)
+    and the levels of the containers changed by the same amount. The objects
+    should end the cycle where they started it.
+
+    Steady cycles are skipped analytically when nothing else can happen in the
+    meantime: no other events are scheduled, nobody waits for the resources of
+    the objects and no pending level event of the containers could be met
+    during the skipped cycles. The time is moved ahead, the levels of the
+    containers are changed and the log entries and trips of the skipped cycles
+    are copied from the last cycle.
+
+    Only cycles of BasicActivity, MoveActivity and ShiftAmountActivity
+    activities (in structural activities) without plugins are skipped, and the
+    log entries should be kept in memory. The simpy events of the skipped
+    cycles do not exist, so no cycles are skipped in an environment that
+    records the simpy steps (CriticalPathEnvironment).
+
+    Parameters
+    ----------
+    activity
+        the while activity
+    """
+
+    def __init__(self, activity):
+        self.env = activity.env
+        activities = get_subprocesses(activity.sub_processes)
+        self.supported = all(
+            isinstance(item, SUPPORTED_ACTIVITIES) or hasattr(item, "sub_processes")
+            for item in activities
+        ) and not any(getattr(item, "plugins", None) for item in activities)
+        self.shift_activities = [
+            item for item in activities if isinstance(item, ShiftAmountActivity)
+        ]
+
+        objects = {}
+        for item in activities:
+            for name in ["mover", "processor", "origin", "destination"]:
+                obj = getattr(item, name, None)
+                if obj is not None:
+                    objects[id(obj)] = obj
+            for obj in getattr(item, "additional_logs", []):
+                objects[id(obj)] = obj
+        self.objects = list(objects.values())
+        self.containers = [obj for obj in self.objects if hasattr(obj, "container")]
+        self.logs = [activity, *activities] + [
+            obj for obj in self.objects if isinstance(obj, core.Log)
+        ]
+        self.supported = self.supported and all(
+            type(log._log_store) is core.LogStore
+            and not log._log_store.has_records
+            and log._log_streamed is None
+            for log in self.logs
+        )
+        # the critical path is determined from the recorded simpy steps
+        self.supported = self.supported and not hasattr(self.env, "data_step")
+
+        # number of cycles that were skipped
+        self.skipped = 0
+        self._signature = None
+        self._snapshot()
+
+    def _get_levels(self, container):
+        return {item["id"]: container.get_level(item["id"]) for item in container.items}
+
+    def _snapshot(self):
+        """Remember the state at the start of the cycle."""
+        self.start = self.env.now
+        self.levels = [self._get_levels(obj.container) for obj in self.containers]
+        self.rows = [len(log._log_store) for log in self.logs]
+        self.geometries = [getattr(obj, "geometry", None) for obj in self.objects]
+        self.trips = [
+            len(obj.trips) if getattr(obj, "trips", None) is not None else 0
+            for obj in self.objects
+        ]
+
+    def _get_entries(self, log, first, levels):
+        """Return the log entries of the cycle, relative to its start."""
+        store = log._log_store
+        states = store.get_object_states(first)
+        for state in states:
+            if "container level" in state:
+                state["container level"] = _relative(state["container level"], levels)
+        return list(
+            zip(
+                (store.timestamps[first:] - self.start).tolist(),
+                store.get_activity_ids(first),
+                store.get_activity_states(first),
+                store.get_activity_labels(first),
+                states,
+            )
+        )
+
+    def _get_signature(self):
+        """Return the description of the cycle that ended now."""
+        container_levels = dict(zip(map(id, self.containers), self.levels))
+        entries = [
+            self._get_entries(log, first, container_levels.get(id(log), {}))
+            for log, first in zip(self.logs, self.rows)
+        ]
+        deltas = []
+        for obj, start in zip(self.containers, self.levels):
+            levels = self._get_levels(obj.container)
+            deltas.append({id_: levels[id_] - start[id_] for id_ in levels})
+        return self.env.now - self.start, deltas, entries
+
+    def _is_closed(self):
+        """Return True if the objects are where they were at the start."""
+        return all(
+            geometry is None or obj.geometry == geometry
+            for obj, geometry in zip(self.objects, self.geometries)
+        )
+
+    def _is_idle(self):
+        """Return True if nothing else is scheduled or waiting for a resource."""
+        # the cycle ends in the process of the loop, which is not scheduled
+        # itself, so any scheduled event (also at the current time) could
+        # change the state during the skipped cycles
+        if self.env.peek() != math.inf:
+            return False
+        return all(
+            not getattr(obj, "resource", None) or not obj.resource.queue
+            for obj in self.objects
+        )
+
+    def _get_excursions(self, obj):
+        """Return the maximum change of the levels of a container within a cycle."""
+        excursions: dict = {}
+        for item in self.shift_activities:
+            if obj not in [item.origin, item.destination]:
+                continue
+            amounts = item.reserved_amount
+            if not isinstance(amounts, dict):
+                amounts = {item.id_: amounts}
+            for id_, amount in amounts.items():
+                for key in [id_, f"{id_}_reservations"]:
+                    excursions[key] = excursions.get(key, 0) + abs(amount)
+        return excursions
+
+    def _get_safe_cycles(self, deltas):
+        """Return the number of cycles in which no pending level event is met."""
+        cycles = math.inf
+        for obj, delta in zip(self.containers, deltas):
+            excursions = self._get_excursions(obj)
+            for (id_, operator), thresholds in obj.container._thresholds.items():
+                if not thresholds or id_ not in delta:
+                    continue
+                cycles = min(
+                    cycles,
+                    _safe_cycles(
+                        obj.container.get_level(id_),
+                        delta[id_],
+                        excursions.get(id_, 0),
+                        operator,
+                        thresholds,
+                    ),
+                )
+            for id_, value in delta.items():
+                if value and not excursions.get(id_):
+                    # the level is changed by something else
+                    return 0
+        return cycles
+
+    def end_cycle(self, max_cycles):
+        """
+        Compare the cycle that ended now with the previous one.
+
+        Return the number of cycles (at most max_cycles) that can be skipped,
+        see skip.
+        """
+        if not self.supported:
+            return 0
+        signature = self._get_signature()
+        steady = signature == self._signature and self._is_closed()
+        self._signature = signature
+        if not steady or max_cycles < 1 or not self._is_idle():
+            self._snapshot()
+            return 0
+        cycles = min(max_cycles, self._get_safe_cycles(signature[1]))
+        if cycles < 1:
+            self._snapshot()
+        return cycles
+
+    def skip(self, cycles):
+        """Skip the cycles, a generator to be used with yield from."""
+        period, deltas, entries = self._signature
+        start = self.env.now
+        yield self.env.timeout(cycles * period)
+
+        for obj, delta, levels in zip(self.containers, deltas, self.levels):
+            for id_, value in delta.items():
+                if value:
+                    obj.container.change_level(cycles * value, id_)
+
+        container_levels = {
+            id(obj): {id_: level + delta[id_] for id_, level in levels.items()}
+            for obj, delta, levels in zip(self.containers, deltas, self.levels)
+        }
+        container_deltas = dict(zip(map(id, self.containers), deltas))
+        for log, log_entries in zip(self.logs, entries):
+            levels = container_levels.get(id(log), {})
+            delta = container_deltas.get(id(log), {})
+            for cycle in range(cycles):
+                cycle_levels = {
+                    id_: level + cycle * delta[id_] for id_, level in levels.items()
+                }
+                for t, activity_id, state, label, object_state in log_entries:
+                    if "container level" in object_state:
+                        object_state = dict(object_state)
+                        object_state["container level"] = _absolute(
+                            object_state["container level"], cycle_levels
+                        )
+                    log.log_entry_v1(
+                        t=start + cycle * period + t,
+                        activity_id=activity_id,
+                        activity_state=core.LogState[state],
+                        additional_state=object_state,
+                        activity_label=label or None,
+                    )
+
+        for obj, first in zip(self.objects, self.trips):
+            if getattr(obj, "trips", None) is not None:
+                obj.trips.repeat(first, cycles, period)
+
+        self.skipped += cycles
+        self._snapshot()
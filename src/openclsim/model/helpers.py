@@ -1,7 +1,4 @@
 """Module with helper functions for the simulation."""
-import logging
-
-logger = logging.getLogger(__name__)
 
 
 def get_subprocesses(items):
@@ -17,33 +14,134 @@ def get_subprocesses(items):
     return items
 
 
+def get_activity_references(expr):
+    """
+    Get the keys (ID or name) of the activities an expression has to wait for.
+
+    The activities in an "or" expression are skipped, as the expression can be
+    met by any of its items.
+    """
+    if isinstance(expr, list):
+        return [key for item in expr for key in get_activity_references(item)]
+    if isinstance(expr, dict):
+        if "and" in expr:
+            return get_activity_references(expr["and"])
+        if expr.get("type") == "activity":
+            return [expr.get("ID", expr.get("name"))]
+    return []
+
+
+def _post_order(roots, dependencies):
+    """
+    Return the nodes reachable from roots in depth first post order.
+
+    So every node comes after the nodes it depends on. If there is a cycle,
+    the cycle (list of nodes) is returned as second value.
+    """
+    order = []
+    state: dict = {}
+    for root in roots:
+        if root in state:
+            continue
+        state[root] = "visiting"
+        stack = [(root, iter(dependencies.get(root, [])))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                state[node] = "visited"
+                order.append(node)
+            elif child not in state:
+                state[child] = "visiting"
+                stack.append((child, iter(dependencies.get(child, []))))
+            elif state[child] == "visiting":
+                path = [node for node, _ in stack]
+                return order, path[path.index(child) :] + [child]
+    return order, None
+
+
+def _get_registration_order(items):
+    """
+    Order the items such that the activities they wait for come first.
+
+    The items keep their order unless they wait for a later item. Next to
+    that, the dependencies between the start and done of the activities are
+    checked: an activity starts after its parent started and after the
+    activities in its start events are done, and it is done after it started
+    and after its sub processes are done. A ValueError is raised if these
+    dependencies have a cycle, in that case some activities would never start.
+    """
+    by_key = {item.name: item for item in items}
+    by_key.update({getattr(item, "id", None): item for item in items})
+
+    waits = {
+        item: [
+            by_key[key]
+            for expr in [item.start_event, getattr(item, "start_event_parent", None)]
+            for key in get_activity_references(expr)
+            if key in by_key
+        ]
+        for item in items
+    }
+
+    dependencies: dict = {}
+    for item in items:
+        dependencies.setdefault((item, "start"), []).extend(
+            (other, "done") for other in waits[item]
+        )
+        dependencies.setdefault((item, "done"), []).append((item, "start"))
+        for sub_process in getattr(item, "sub_processes", []):
+            dependencies.setdefault((sub_process, "start"), []).append((item, "start"))
+            dependencies[(item, "done")].append((sub_process, "done"))
+
+    _, cycle = _post_order([(item, "done") for item in items], dependencies)
+    if cycle is not None:
+        raise ValueError(
+            "Due to recursion in the events of the activities, not all the "
+            "activities can be registered: "
+            + " -> ".join(f"{item.name} ({event})" for item, event in cycle)
+        )
+
+    order, _ = _post_order(items, waits)
+    return order
+
+
 def register_processes(processes):
-    """Register all the (sub)processes iteratively."""
+    """
+    Register all the (sub)processes.
+
+    The processes are registered in the order of their dependencies (see
+    _get_registration_order), so every activity is registered once.
+    """
+    order = get_registration_order(processes)
+
+    for item in order:
+        item.main_process = None
+
+    for item in order:
+        item.register_process()
+
+
+def get_registration_order(processes):
+    """Return all the (sub)processes in the order of registration."""
     items = get_subprocesses(processes)
 
     item_names = [i.name for i in items]
     assert len(item_names) == len(set(item_names))
 
-    for item in items:
+    return _get_registration_order(items)
+
+
+def restart_processes(order):
+    """
+    Run all the (sub)processes again, in their long lived processes.
+
+    The processes should be registered before and done, the order is the
+    result of get_registration_order.
+    """
+    for item in order:
         item.main_process = None
 
-    registerd_items = []
-    for _ in range(100):
-        # Subtracting sets does not work since this changes the order, which will
-        # introduce randomness in the output.
-        unregistered_items = [
-            i for i in items if i.name not in [e.name for e in registerd_items]
-        ]
-        if len(unregistered_items) == 0:
-            break
-        for item in unregistered_items:
-            try:
-                item.register_process()
-                registerd_items.append(item)
-            except Exception as e:
-                logger.info(e)
-    else:
-        raise ValueError(
-            "Due to recursion in the events of the activities, not all the activities "
-            "can be registered."
-        )
+    for item in order:
+        item.register_process(reuse=True)
@@ -48,8 +48,32 @@ class ParallelActivity(GenericActivity, RegisterSubProcesses):
 
         self.start_parallel.succeed()
 
-        stop_events = []
-        subprocess_ids = []
+        # every sub process reports its completion, which is logged at once,
+        # and all_done is triggered by the last one
+        all_done = env.event()
+        pending = {}
+
+        def report_done(event, sub_process):
+            if not event.ok:
+                # pass the failure of the sub process on to this activity
+                event.defused = True
+                if not all_done.triggered:
+                    all_done.fail(event.value)
+                return
+            pending[sub_process.id] -= 1
+            if pending[sub_process.id] > 0:
+                return
+            del pending[sub_process.id]
+            activity_log.log_entry_v1(
+                t=env.now,
+                activity_id=activity_log.id,
+                activity_state=core.LogState.STOP,
+                activity_label={"type": "subprocess", "ref": sub_process.id},
+            )
+            if not pending and not all_done.triggered:
+                all_done.succeed()
+
+        processes = []
         for sub_process in self.sub_processes:
             activity_log.log_entry_v1(
                 t=env.now,
@@ -58,34 +82,28 @@ class ParallelActivity(GenericActivity, RegisterSubProcesses):
                 activity_label={"type": "subprocess", "ref": sub_process.id},
             )
 
-            stop_events.append(
-                {"type": "activity", "state": "done", "name": sub_process.name}
+            # the sub process is done when all activities of its name are done
+            activities = self.get_done_condition(sub_process).activities
+            pending[sub_process.id] = len(activities)
+            processes.extend(
+                (activity_item.main_process, sub_process)
+                for activity_item in activities
             )
-            subprocess_ids.append(sub_process.id)
 
-        # wait until all stop events are processed
-        while len(stop_events) > 0:
-            # wait until any stop event is processed
-            event_trigger = self.parse_expression(
-                [{"or": [event for event in stop_events]}]
-            )
-            yield event_trigger
-            # add a log line for each stop event and pop it
-            i = 0
-            while i < len(stop_events):
-                if self.parse_expression(stop_events[i]).triggered is True:
-                    stop_events.pop(i)
-                    activity_log.log_entry_v1(
-                        t=env.now,
-                        activity_id=activity_log.id,
-                        activity_state=core.LogState.STOP,
-                        activity_label={
-                            "type": "subprocess",
-                            "ref": subprocess_ids.pop(i),
-                        },
+        for process, sub_process in processes:
+            if process.callbacks is None:
+                # the process is processed already
+                report_done(process, sub_process)
+            else:
+                process.callbacks.append(
+                    lambda event, sub_process=sub_process: report_done(
+                        event, sub_process
                     )
-                else:
-                    i += 1
+                )
+
+        # wait until all sub processes are done
+        if pending:
+            yield all_done
 
         activity_log.log_entry_v1(
             t=env.now,
@@ -2,6 +2,7 @@
 import openclsim.core as core
 
 from .base_activities import GenericActivity, RegisterSubProcesses
+from .condition import AllOfCondition
 
 
 class SequentialActivity(GenericActivity, RegisterSubProcesses):
@@ -59,16 +60,8 @@ class SequentialActivity(GenericActivity, RegisterSubProcesses):
                 },
             )
 
-            stop_event = self.parse_expression(
-                [
-                    {
-                        "type": "activity",
-                        "state": "done",
-                        "name": sub_process.name,
-                    }
-                ]
-            )
-            yield stop_event
+            stop_event = AllOfCondition(self, [self.get_done_condition(sub_process)])
+            yield stop_event.event()
 
             activity_log.log_entry_v1(
                 t=env.now,
@@ -27,7 +27,11 @@ class ShiftAmountActivity(GenericActivity):
     processor
         resource responsible to implement the transfer.
     amount
-        the maximum amount of objects to be transfered.
+        the maximum amount of objects to be transfered. In case of
+        MultiContainers, a dictionary with the maximum amount by container id
+        shifts a bundle of several containers at once: the resources are
+        requested once and the bundle is moved in one atomic transfer (see
+        EventsContainer.transfer), with the duration of the total amount.
     duration
         time specified in seconds on how long it takes to transfer the objects.
     phase
@@ -35,7 +39,8 @@ class ShiftAmountActivity(GenericActivity):
         Use phase with LoadingFunction/UnLoadingFunction
     id_
         in case of MultiContainers the id_ of the container, where the objects should
-        be removed from or assiged to respectively.
+        be removed from or assiged to respectively. Not used if amount is a
+        dictionary.
     start_event
         the activity will start as soon as this event is processed
         by default will be to start immediately
@@ -82,37 +87,19 @@ class ShiftAmountActivity(GenericActivity):
             self.requested_resources, self.destination.resource
         )
 
-        amount = self.processor.determine_processor_amount(
-            self.origin, self.destination, self.amount, self.id_
-        )
+        amount = self._determine_amount()
 
         all_available = False
-        while not all_available and amount > 0:
-            amount = self.processor.determine_processor_amount(
-                self.origin, self.destination, self.amount, self.id_
-            )
+        while not all_available and self._has_amount(amount):
+            amount = self._determine_amount()
 
             # yield until enough content and space available in origin and destination
-            yield env.all_of(
-                events=[
-                    self.origin.container.get_container_event(
-                        level=amount,
-                        operator="ge",
-                        id_=self.id_,
-                    ),
-                    self.destination.container.get_container_event(
-                        level=self.destination.container.get_capacity(self.id_)
-                        - amount,
-                        operator="le",
-                        id_=self.id_,
-                    ),
-                ]
-            )
+            yield self._get_available_event(env, amount)
 
             yield from self._request_resource(
                 self.requested_resources, self.processor.resource
             )
-            if self.origin.container.get_level(self.id_) < amount:
+            if not self._is_available(amount):
                 # someone removed / added content while we were requesting the
                 # processor, so abort and wait for available
                 # space/content again
@@ -125,7 +112,7 @@ class ShiftAmountActivity(GenericActivity):
             yield from self._request_resource(
                 self.requested_resources, self.origin.resource
             )
-            if self.origin.container.get_level(self.id_) < amount:
+            if not self._is_available(amount):
                 self._release_resource(
                     self.requested_resources,
                     self.processor.resource,
@@ -180,6 +167,73 @@ class ShiftAmountActivity(GenericActivity):
                 self.requested_resources, self.processor.resource, self.keep_resources
             )
 
+    @property
+    def is_bundle(self):
+        """True if a bundle of several containers is shifted at once."""
+        return isinstance(self.amount, dict)
+
+    def _determine_amount(self):
+        if self.is_bundle:
+            return self._determine_bundle_amount()
+        return self.processor.determine_processor_amount(
+            self.origin, self.destination, self.amount, self.id_
+        )
+
+    def _determine_bundle_amount(self):
+        """
+        Return the amounts of the bundle that can be shifted, by container id.
+
+        The amount of a container is at most the requested amount, the level
+        of the origin and the space left in the destination. Containers of
+        which nothing can be shifted (an empty origin or a full destination)
+        are left out of the bundle.
+        """
+        origin = self.origin.container
+        destination = self.destination.container
+        amounts = {}
+        for id_, requested in self.amount.items():
+            amount = min(
+                origin.get_level(id_),
+                destination.get_capacity(id_) - destination.get_level(id_),
+            )
+            if requested is not None:
+                amount = min(requested, amount)
+            if amount > 0:
+                amounts[id_] = amount
+        return amounts
+
+    def _has_amount(self, amount):
+        if self.is_bundle:
+            return len(amount) > 0
+        return amount > 0
+
+    def _get_available_event(self, env, amount):
+        if self.is_bundle:
+            return self.origin.container.get_transfer_event(
+                self.destination.container, amount
+            )
+        return env.all_of(
+            events=[
+                self.origin.container.get_container_event(
+                    level=amount,
+                    operator="ge",
+                    id_=self.id_,
+                ),
+                self.destination.container.get_container_event(
+                    level=self.destination.container.get_capacity(self.id_) - amount,
+                    operator="le",
+                    id_=self.id_,
+                ),
+            ]
+        )
+
+    def _is_available(self, amount):
+        if self.is_bundle:
+            return self.origin.container.can_transfer(
+                self.destination.container, amount
+            )
+        return self.origin.container.get_level(self.id_) >= amount
+
     def _shift_amount(
         self,
         env,
@@ -189,6 +243,31 @@ class ShiftAmountActivity(GenericActivity):
         self.processor.activity_id = activity_id
         self.origin.activity_id = activity_id
 
+        if self.is_bundle:
+            # release the reservations of the containers left out of the bundle
+            for id_, reserved_amount in self.reserved_amount.items():
+                if id_ not in amount:
+                    self.destination.container.change_level(
+                        -reserved_amount, f"{id_}_reservations"
+                    )
+                    self.origin.container.change_level(
+                        reserved_amount, f"{id_}_reservations"
+                    )
+            if not amount:
+                # nothing of the bundle can be shifted
+                return
+
+            shiftamount_fcn = self._get_shiftamount_fcn(sum(amount.values()))
+            duration, _ = shiftamount_fcn(self.origin, self.destination)
+            yield from self.processor.process_bundle(
+                origin=self.origin,
+                destination=self.destination,
+                amounts=amount,
+                duration=duration,
+                reserved_amounts={id_: self.reserved_amount[id_] for id_ in amount},
+            )
+            return
+
         shiftamount_fcn = self._get_shiftamount_fcn(amount)
 
         yield from self.processor.process(
@@ -213,6 +292,22 @@ class ShiftAmountActivity(GenericActivity):
             )
 
     def make_container_reservation(self):
+        if self.is_bundle:
+            # the reservations of a bundle are changed synchronously
+            self.reserved_amount = {}
+            for id_, amount in self.amount.items():
+                reserved_amount = self.processor.determine_reservation_amount(
+                    self.origin, self.destination, amount=amount, id_=id_
+                )
+                self.destination.container.change_level(
+                    reserved_amount, f"{id_}_reservations"
+                )
+                self.origin.container.change_level(
+                    -reserved_amount, f"{id_}_reservations"
+                )
+                self.reserved_amount[id_] = reserved_amount
+            return
+
         self.reserved_amount = self.processor.determine_reservation_amount(
             self.origin, self.destination, amount=self.amount, id_=self.id_
         )
@@ -3,7 +3,9 @@
 import openclsim.core as core
 
 from .base_activities import GenericActivity, RegisterSubProcesses
-from .helpers import register_processes
+from .condition import AllOfCondition
+from .fast_forward import SteadyCycles
+from .helpers import get_registration_order, register_processes, restart_processes
 
 
 class ConditionProcessMixin:
@@ -26,7 +28,23 @@ class ConditionProcessMixin:
             activity_state=core.LogState.START,
         )
 
-        static_condition_event = self.parse_expression(self.condition_event)
+        condition = self.get_condition("condition_event")
+        static_condition_event = condition.event()
+        stop_conditions = {
+            sub_process.name: AllOfCondition(
+                self, [self.get_done_condition(sub_process)]
+            )
+            for sub_process in self.sub_processes
+        }
+        # with reuse_processes the sub processes are run again every iteration
+        # in their long lived processes, in the order computed once (the
+        # container reservations are still made every iteration)
+        reuse = getattr(env, "reuse_processes", False)
+        order = None
+        # with fast_forward the steady cycles are skipped, see SteadyCycles
+        self.steady_cycles = (
+            SteadyCycles(self) if getattr(env, "fast_forward", False) else None
+        )
         repetitions = 1
         while True:
             self.start_sequence.succeed()
@@ -41,16 +59,7 @@ class ConditionProcessMixin:
                     },
                 )
 
-                stop_event = self.parse_expression(
-                    [
-                        {
-                            "type": "activity",
-                            "state": "done",
-                            "name": sub_process.name,
-                        }
-                    ]
-                )
-                yield stop_event
+                yield stop_conditions[sub_process.name].event()
 
                 activity_log.log_entry_v1(
                     t=env.now,
@@ -69,17 +78,30 @@ class ConditionProcessMixin:
             if (
                 repetitions >= self.max_iterations
                 or static_condition_event.processed is True
-                or self.parse_expression(self.condition_event).processed is True
+                or condition.is_processed()
             ):
                 break
             else:
                 repetitions += 1
 
+                if self.steady_cycles is not None:
+                    cycles = self.steady_cycles.end_cycle(
+                        self.max_iterations - repetitions
+                    )
+                    if cycles:
+                        yield from self.steady_cycles.skip(cycles)
+                        repetitions += cycles
+
                 # Reset the sequential start events of the subprocesses
                 self.register_subprocesses()
 
                 # Re-add the activities to the simpy environment
-                register_processes(self.sub_processes)
+                if not reuse:
+                    register_processes(self.sub_processes)
+                    continue
+                if order is None:
+                    order = get_registration_order(self.sub_processes)
+                restart_processes(order)
         activity_log.log_entry_v1(
             t=env.now,
             activity_id=activity_log.id,
@@ -106,6 +128,9 @@ class WhileActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesses
     start_event
         the activity will start as soon as this event is processed
         by default will be to start immediately
+
+    If the fast_forward attribute of the environment is True, the steady
+    cycles are skipped analytically, see SteadyCycles.
     """
 
     def __init__(self, sub_processes, condition_event, show=False, *args, **kwargs):
@@ -116,6 +141,7 @@ class WhileActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesses
 
         self.condition_event = condition_event
         self.max_iterations = 1_000_000
+        self.steady_cycles = None
 
         self.register_subprocesses = self.register_sequential_subprocesses
         self.register_subprocesses()
@@ -143,6 +169,7 @@ class RepeatActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesse
         self.print = show
         self.sub_processes = sub_processes
         self.max_iterations = repetitions
+        self.steady_cycles = None
         self.condition_event = [
             {"type": "activity", "state": "done", "name": self.name}
         ]
@@ -1,5 +1,6 @@
 """Get the log of the simulation objects in a pandas dataframe."""
 
+import numpy as np
 import pandas as pd
 
 from openclsim.model import get_subprocesses
@@ -11,7 +12,9 @@ def get_log_dataframe(simulation_object, id_map=None):
     Parameters
     ----------
     simulation_object
-        object from which the log is returned as a dataframe sorted by "Timestamp"
+        object from which the log is returned as a dataframe sorted by "Timestamp".
+        The sort is stable, so entries with the same timestamp keep the order in
+        which they were logged.
     id_map
         by default uuids are not resolved. id_map solves this at request:
         * a list of top-activities of which also all sub-activities
@@ -26,21 +29,46 @@ def get_log_dataframe(simulation_object, id_map=None):
     else:
         id_map = id_map if id_map else {}
 
-    df = (
-        pd.DataFrame(simulation_object.log)
-        .sort_values(by=["Timestamp"])
-        .sort_values(by=["Timestamp"])
+    log = simulation_object.log
+    df = pd.DataFrame(log).sort_values(by="Timestamp", kind="stable")
+    activities = df.filter(items=["ActivityID"]).rename(
+        columns={"ActivityID": "Activity"}
     )
+    if "Activity" in activities:
+        activities["Activity"] = replace_ids(activities["Activity"], id_map)
     return pd.concat(
         [
-            (
-                df.filter(items=["ActivityID"])
-                .rename(columns={"ActivityID": "Activity"})
-                .replace(id_map)
-            ),
-            pd.DataFrame(simulation_object.log).filter(["Timestamp", "ActivityState"]),
-            pd.DataFrame(simulation_object.log["ObjectState"]),
-            pd.DataFrame(simulation_object.log["ActivityLabel"]),
+            activities,
+            pd.DataFrame(log).filter(["Timestamp", "ActivityState"]),
+            pd.DataFrame(log["ObjectState"]),
+            pd.DataFrame(log["ActivityLabel"]),
         ],
         axis=1,
     )
+
+
+def replace_ids(ids, id_map):
+    """Replace the ids in a pandas Series by the names in id_map.
+
+    The result is the same as ids.replace(id_map), but the ids are factorized
+    to integer codes first, so id_map is only looked up once per unique id.
+
+    Parameters
+    ----------
+    ids
+        pandas Series with (activity) ids
+    id_map
+        dictionary to resolve the ids to names, ids not in id_map are kept
+    """
+    if not id_map or not len(ids):
+        return ids
+
+    codes, uniques = pd.factorize(ids)
+    names = np.empty(len(uniques) + 1, dtype=object)
+    names[:-1] = [id_map.get(id_, id_) for id_ in uniques]
+    values = names[codes]
+
+    # missing values (code -1) are kept as is
+    missing = codes < 0
+    values[missing] = ids.to_numpy()[missing]
+    return pd.Series(values, index=ids.index, name=ids.name).infer_objects()
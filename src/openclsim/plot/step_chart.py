@@ -2,12 +2,16 @@
 
 import matplotlib.pyplot as plt
 
+import openclsim.core as core
+
 from .log_dataframe import get_log_dataframe
 
 
 def get_step_chart(simulation_objects, container_map=None):
     """Get the step chart of the container levels.
 
+    The simulation objects should log at least at LogLevel BASE.
+
     Parameters
     ----------
     simulation_objects
@@ -19,6 +23,7 @@ def get_step_chart(simulation_objects, container_map=None):
     # default argument
     if container_map is None:
         container_map = {"default": ""}
+    core.check_log_level(simulation_objects, core.LogLevel.BASE, "The step chart")
 
     fig = plt.figure(figsize=(14, 7))
     for obj in simulation_objects:
@@ -5,6 +5,7 @@ import random
 import plotly.graph_objs as go
 from plotly.offline import init_notebook_mode, iplot
 
+import openclsim.core as core
 from openclsim.model import get_subprocesses
 
 from .log_dataframe import get_log_dataframe
@@ -53,6 +54,8 @@ def get_gantt_chart(
 ):
     """Create a plotly GANTT chart of the planning of vessels.
 
+    The concepts should log at least at LogLevel BASE.
+
     Parameters
     ----------
     concepts
@@ -67,6 +70,7 @@ def get_gantt_chart(
         * a manual id_map to resolve uuids to labels, e.g. {'uuid1':'name1'}
     """
     default_blockwidth = 10
+    core.check_log_level(concepts, core.LogLevel.BASE, "The GANTT chart")
 
     if type(id_map) == list:
         id_map = {act.id: act.name for act in get_subprocesses(id_map)}
@@ -0,0 +1,59 @@
+"""Test module for the compiled expressions of the activities."""
+
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+
+def test_compiled_once():
+    """Test that the expressions of a while loop are compiled once."""
+    env = simpy.Environment()
+    registry = {}
+    sub_processes = [
+        model.BasicActivity(
+            env=env, name=f"activity {i}", registry=registry, duration=1
+        )
+        for i in range(3)
+    ]
+    sequence = model.SequentialActivity(
+        env=env, name="sequence", registry=registry, sub_processes=sub_processes
+    )
+    repeat = model.RepeatActivity(
+        env=env,
+        name="repeat",
+        registry=registry,
+        sub_processes=[sequence],
+        repetitions=100,
+    )
+    model.register_processes([repeat])
+    env.run()
+
+    assert env.now == 300
+    stats = model.get_expression_stats(env)
+    # the activity expressions are compiled once, only the new start events
+    # of the sequences (simpy events) are compiled in every cycle
+    assert stats["compiled"] < 2 * 100 + 10
+    assert stats["events"] > 8 * 100
+
+
+def test_condition():
+    """Test the events and polls of a compiled container expression."""
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    env = simpy.Environment()
+    site = Site(env=env, name="site", capacity=10, level=0)
+    activity = model.BasicActivity(env=env, name="activity", registry={}, duration=1)
+
+    condition = model.compile_expression(
+        activity, {"type": "container", "concept": site, "state": "full"}
+    )
+    assert isinstance(condition, model.Condition)
+    assert not condition.poll()
+    event = condition.event()
+    assert not condition.is_processed()
+
+    site.container.put(10)
+    env.run()
+    assert event.processed
+    assert condition.poll()
+    assert condition.is_processed()
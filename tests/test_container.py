@@ -1,5 +1,6 @@
 """Test module for the openclsim container."""
 
+import pytest
 import simpy
 
 from openclsim import core
@@ -106,3 +107,176 @@ def test_empty_full_events():
 
     env.process(process())
     env.run()
+
+
+def test_container_state():
+    """Test the levels and capacities of multiple containers by id."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container(
+        [
+            {"id": "sand", "capacity": 10, "level": 5},
+            {"id": "gravel", "capacity": 20, "level": 0},
+        ]
+    )
+
+    def process():
+        yield container.put(3, id_="gravel")
+        yield container.get(2, id_="sand_reservations")
+
+    env.process(process())
+    env.run()
+
+    assert container.container_list == ["sand", "gravel"]
+    assert container.get_level("sand") == 5
+    assert container.get_level("sand_reservations") == 3
+    assert container.get_level("gravel") == 3
+    assert container.get_capacity("gravel") == 20
+    assert container.get_level("unknown") == 0
+    assert container.get_capacity("unknown") == 0
+    assert [item["id"] for item in container.items] == [
+        "sand",
+        "sand_reservations",
+        "gravel",
+        "gravel_reservations",
+    ]
+
+
+def test_container_event_index():
+    """Test that only crossed levels are triggered and removed from the index."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 5}])
+
+    def process():
+        at_least = {
+            level: container.get_container_event(level, "ge") for level in range(11)
+        }
+        at_most = {
+            level: container.get_container_event(level, "lt") for level in range(11)
+        }
+        assert container._thresholds[("default", "ge")] == [6, 7, 8, 9, 10]
+        assert container._thresholds[("default", "lt")] == [0, 1, 2, 3, 4, 5]
+
+        yield container.put(3)
+        assert [level for level, e in at_least.items() if e.triggered] == list(range(9))
+        assert container._thresholds[("default", "ge")] == [9, 10]
+
+        yield container.get(6)
+        assert [level for level, e in at_most.items() if e.triggered] == list(
+            range(3, 11)
+        )
+        assert container._thresholds[("default", "lt")] == [0, 1, 2]
+        yield container.put(3)
+
+        # a triggered event is returned until it is processed
+        full_event = container.get_full_event()
+        assert full_event is at_least[10]
+        yield container.put(5)
+        assert full_event.triggered
+        assert container.get_full_event() is full_event
+
+        # a processed event is forgotten, a new request returns a new event
+        yield full_event
+        assert ("default", 10, "ge") not in container._container_events
+        assert container.get_full_event() is not full_event
+
+        yield container.get(1)
+        assert not container.get_full_event().triggered
+
+    env.process(process())
+    env.run()
+
+
+def test_container_events_bounded():
+    """Test that the processed level events are not kept."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 1000, "level": 0}])
+
+    def process():
+        for level in range(1, 1001):
+            event = container.get_container_event(level, "ge")
+            yield container.put(1)
+            yield event
+            assert len(container._container_events) <= 1
+            assert len(container._event_order) <= 1
+
+    env.process(process())
+    env.run()
+    assert container._container_events == {}
+    assert container._event_order == {}
+
+
+def test_check_possible_shift():
+    """Test that a shift changes the levels directly and only waits for content."""
+    env = simpy.Environment()
+    Vessel = type(
+        "Vessel", (core.Identifiable, core.Log, core.HasContainer, core.Processor), {}
+    )
+    vessel = Vessel(env=env, name="vessel", capacity=10)
+    vessel.activity_id = "shift"
+    site = Vessel(env=env, name="site", capacity=10, level=3)
+
+    def shift():
+        yield from vessel.check_possible_shift(site, vessel, 5, "get", 5)
+        yield from vessel.check_possible_shift(site, vessel, 5, "put", 5)
+
+    def supply():
+        yield env.timeout(100)
+        site.container.change_level(2)
+
+    env.process(shift())
+    env.process(supply())
+    env.run()
+
+    assert site.container.get_level() == 0
+    assert vessel.container.get_level() == 5
+    assert vessel.log["ActivityState"] == ["WAIT_START", "WAIT_STOP"]
+    assert [t.timestamp() for t in vessel.log["Timestamp"]] == [0, 100]
+
+
+def test_check_possible_shift_fractional():
+    """Test that a shift of fractional amounts is not stopped by rounding errors."""
+    env = simpy.Environment()
+    Vessel = type(
+        "Vessel", (core.Identifiable, core.Log, core.HasContainer, core.Processor), {}
+    )
+    vessel = Vessel(env=env, name="vessel", capacity=1)
+    vessel.activity_id = "shift"
+    site = Vessel(env=env, name="site", capacity=1)
+    quay = Vessel(env=env, name="quay", capacity=0.3, level=0.1)
+
+    def shift():
+        yield from vessel.check_possible_shift(site, vessel, 1, "get", 1)
+        yield from vessel.check_possible_shift(vessel, quay, 0.3, "put", 0.3)
+
+    def supply():
+        # ten times 0.1 adds up to slightly less than 1
+        for _ in range(10):
+            yield env.timeout(1)
+            site.container.change_level(0.1)
+        # 0.1 + 0.2 - 0.3 leaves slightly less room than 0.3
+        quay.container.change_level(0.2)
+        yield env.timeout(1)
+        quay.container.change_level(-0.3)
+
+    env.process(shift())
+    env.process(supply())
+    env.run()
+
+    assert env.now == 11
+    assert abs(site.container.get_level()) < 1e-9
+    assert abs(quay.container.get_level() - 0.3) < 1e-9
+
+
+def test_store_capacity_deprecated():
+    """Test that the store_capacity is deprecated and does not limit the items."""
+    env = simpy.Environment()
+    with pytest.warns(DeprecationWarning):
+        container = core.EventsContainer(env=env, store_capacity=1)
+    container.initialize_container(
+        [{"id": f"item {i}", "capacity": 10, "level": i} for i in range(3)]
+    )
+    assert len(container.items) == 6
+    assert container.get_level("item 2") == 2
@@ -27,6 +27,7 @@ def test_get_recorded_activity_df_2_barges(simulation_2_barges):
     assert (
         len(recorded_activities_df.cp_activity_id.unique()) == 254
     ), "254 unique activities"
+    assert all(isinstance(id_, str) for id_ in recorded_activities_df.cp_activity_id)
     assert list(recorded_activities_df.columns) == [
         "ActivityID",
         "Activity",
@@ -8,6 +8,8 @@ from openclsim.critical_path.dependencies_from_simpy_step import (
     DependenciesFromSimpy,
 )
 
+from .conftest import demo_data_simple
+
 
 def test_altered_step_environment():
     """Test AlteredStepEnv."""
@@ -58,6 +60,17 @@ def test_get_critical_path_df_simple_simulation(simulation_while_sequential):
     assert critical_df.is_critical.sum() == 149, "149 critical activities expected"
 
 
+def test_get_critical_path_df_fast_forward():
+    """Test that the steady cycles are not skipped in a CriticalPathEnvironment."""
+    FastForwardEnvironment = type(
+        "FastForwardEnvironment", (CriticalPathEnvironment,), {"fast_forward": True}
+    )
+    simulation = demo_data_simple(env=FastForwardEnvironment)
+    my_cp = DependenciesFromSimpy(**simulation)
+    critical_df = my_cp.get_critical_path_df()
+    assert critical_df.is_critical.sum() == 149, "149 critical activities expected"
+
+
 def test_get_critical_path_df_storm(simulation_2_barges_custom_env_storm):
     """Test get_critical_path_df method in 2 barge simulation with weather delay."""
     my_cp = DependenciesFromSimpy(**simulation_2_barges_custom_env_storm)
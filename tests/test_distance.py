@@ -0,0 +1,92 @@
+"""Test module for the great circle distances."""
+
+import numpy as np
+import pytest
+import shapely.geometry
+import simpy
+
+from openclsim import core
+
+from .conftest import demo_data
+
+
+def test_distance_cache():
+    """Test the LRU distance cache and its statistics."""
+    a = shapely.geometry.Point(4.18, 52.18)
+    b = shapely.geometry.Point(4.25, 52.11)
+    c = {"type": "Point", "coordinates": (4.35, 52.01)}
+    _, _, expected = core.distance.WGS84.inv(4.18, 52.18, 4.25, 52.11)
+
+    cache = core.DistanceCache(maxsize=2)
+    assert cache.distance(a, b) == expected
+    assert cache.distance(a, b) == expected
+    assert core.compute_distance(a, b) == expected
+    assert cache.cache_info() == (1, 1, 2, 1)
+
+    # the least recently used distance (b, a) is removed from the full cache
+    cache.distance(b, a)
+    cache.distance(a, b)
+    cache.distance(a, c)
+    assert len(cache) == 2
+    cache.distance(b, a)
+    assert cache.cache_info() == (2, 4, 2, 2)
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_distance_cache_simulation():
+    """Test that the distances of a cyclic simulation are shared per environment."""
+    simulation = demo_data(nr_barges=2, total_amount=100)
+    info = simulation["env"].distance_cache.cache_info()
+    # the barges sail between the same two sites and check their position
+    assert info.currsize <= 4
+    assert info.hits > 10 * info.misses
+
+
+def test_distance_matrix(tmp_path):
+    """Test the precomputed distance matrix, also on disk and in a simulation."""
+    simulation = demo_data(nr_barges=2, total_amount=100)
+    objects = simulation["object_list"]
+    matrix = core.DistanceMatrix.from_locatables(objects)
+    assert len(matrix) == 3
+
+    a, b, _ = matrix.coordinates.tolist()
+    _, _, expected = core.distance.WGS84.inv(*a, *b)
+    assert matrix.get(tuple(a), tuple(b)) == expected
+    assert matrix.distance(objects[0].geometry, objects[0].geometry) == 0
+    assert matrix.get(tuple(a), (0.0, 0.0)) is None
+
+    matrix.save(tmp_path / "matrix.npz")
+    loaded = core.DistanceMatrix.load(tmp_path / "matrix.npz")
+    assert (loaded.distances == matrix.distances).all()
+
+    class MatrixEnvironment(simpy.Environment):
+        distance_matrix = loaded
+
+    simulation_matrix = demo_data(nr_barges=2, total_amount=100, env=MatrixEnvironment)
+    assert simulation_matrix["env"].now == simulation["env"].now
+    assert simulation_matrix["env"].distance_cache.cache_info().misses == 0
+
+
+@pytest.mark.parametrize("method", ["haversine", "equirectangular"])
+def test_distance_method(method):
+    """Test the spherical distance backends against the exact distance."""
+    lon = np.array([4.18055556, 4.25222222, 4.35222222])
+    lat = np.array([52.18664444, 52.11428333, 52.11428333])
+    exact = core.distance.geodesic(lon, lat, lon[::-1], lat[::-1])
+    approximate = core.distance.DISTANCE_METHODS[method](lon, lat, lon[::-1], lat[::-1])
+    np.testing.assert_allclose(approximate, exact, rtol=5e-3)
+
+    class Environment(simpy.Environment):
+        distance_method = method
+
+    simulation = demo_data(nr_barges=2, total_amount=100)
+    simulation_method = demo_data(nr_barges=2, total_amount=100, env=Environment)
+    assert simulation_method["env"].distance_cache.method == method
+    assert simulation_method["env"].now == pytest.approx(
+        simulation["env"].now, rel=5e-3
+    )
+    # all objects share the same geodesic engine
+    objects = simulation["object_list"]
+    assert objects[0].wgs84 is objects[1].wgs84 is core.distance.WGS84
@@ -0,0 +1,70 @@
+"""Test module for the environment wide event journal."""
+
+import pandas as pd
+import simpy
+
+from openclsim import core
+from openclsim.critical_path.base_cp import BaseCP
+
+from .conftest import demo_data
+
+TestCP = type("TestCP", (BaseCP,), {"get_dependency_list": None})
+
+
+class JournalEnvironment(simpy.Environment):
+    """Environment with an event journal."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event_journal = core.EventJournal()
+
+
+def sort_all(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_event_journal():
+    """Test that the logs and combined logs are the same with a journal."""
+    simulation = demo_data(nr_barges=2, total_amount=100)
+    simulation_journal = demo_data(
+        nr_barges=2, total_amount=100, env=JournalEnvironment
+    )
+
+    journal = simulation_journal["env"].event_journal
+    objects = simulation_journal["object_list"]
+    assert journal.contains(objects)
+    assert len(journal) == sum(len(obj.logbook) for obj in journal.objects)
+
+    for obj, obj_journal in zip(simulation["object_list"], objects):
+        log, log_journal = obj.log, obj_journal.log
+        assert log["Timestamp"] == log_journal["Timestamp"]
+        assert log["ActivityState"] == log_journal["ActivityState"]
+        assert log["ObjectState"] == log_journal["ObjectState"]
+        assert list(obj_journal.logbook)[-1] == obj_journal.logbook[-1]
+
+    # the activity ids differ between the runs, compare the names
+    combined = TestCP(**simulation).combine_logs().drop(columns="ActivityID")
+    combined_journal = TestCP(**simulation_journal).combine_logs()
+    assert combined_journal["Timestamp"].is_monotonic_increasing
+    combined_journal = combined_journal.drop(columns="ActivityID")
+    pd.testing.assert_frame_equal(sort_all(combined), sort_all(combined_journal))
+
+
+def test_event_journal_views():
+    """Test the per object views on the journal."""
+    env = simpy.Environment()
+    env.event_journal = core.EventJournal()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    sites = [Site(env=env, name=name, capacity=10) for name in ["a", "b"]]
+
+    sites[0].log_entry_v1(0, "activity", core.LogState.START)
+    sites[1].log_entry_v1(1, "activity", core.LogState.START)
+    sites[0].log_entry_v1(2, "activity", core.LogState.STOP)
+
+    assert env.event_journal.object_codes.tolist() == [0, 1, 0]
+    assert sites[0].log["ActivityState"] == ["START", "STOP"]
+    assert sites[1].logbook[0]["Timestamp"] == pd.Timestamp(1, unit="s")
+
+    df = env.event_journal.get_dataframe([sites[0]])
+    assert df["Object"].tolist() == ["a", "a"]
+    assert df["ActivityState"].tolist() == ["START", "STOP"]
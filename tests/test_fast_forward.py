@@ -0,0 +1,140 @@
+"""Test module for the fast-forward of the steady cycles."""
+
+import numpy as np
+import pytest
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+from openclsim.model.fast_forward import _safe_cycles
+
+
+def run_single_run(fast_forward, competitor=False):
+    """
+    Run a single run process of a hopper with 50 cycles.
+
+    The competitor takes material from the origin at the end of the fifth
+    cycle, it waits (at the same time) until after the cycle has ended.
+    """
+    env = simpy.Environment()
+    env.fast_forward = fast_forward
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.ContainerDependentMovable,
+            core.Processor,
+            core.LoadingFunction,
+            core.UnloadingFunction,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    location_to_site = shapely.geometry.Point(4.25222222, 52.11428333)
+
+    from_site = Site(
+        env=env,
+        name="Winlocatie",
+        geometry=location_from_site,
+        capacity=50_000,
+        level=50_000,
+    )
+    to_site = Site(
+        env=env,
+        name="Dumplocatie",
+        geometry=location_to_site,
+        capacity=50_000,
+        level=0,
+    )
+    hopper = TransportProcessingResource(
+        env=env,
+        name="Hopper 01",
+        geometry=location_from_site,
+        capacity=1000,
+        compute_v=lambda x: 10 + 2 * x,
+        loading_rate=1,
+        unloading_rate=5,
+    )
+    single_run, while_activity = model.single_run_process(
+        name="single_run",
+        registry={},
+        env=env,
+        origin=from_site,
+        destination=to_site,
+        mover=hopper,
+        loader=hopper,
+        unloader=hopper,
+    )
+    model.register_processes([while_activity])
+
+    def compete():
+        yield to_site.container.get_container_event(level=5000, operator="ge")
+        for _ in range(20):
+            yield env.timeout(0)
+        for id_ in ["default", "default_reservations"]:
+            from_site.container.change_level(-30_000, id_)
+
+    if competitor:
+        env.process(compete())
+    env.run()
+
+    objects = [while_activity, *single_run, from_site, to_site, hopper]
+    names = {obj.id: obj.name for obj in objects}
+    logs = []
+    for obj in objects:
+        log = obj.log
+        log["ActivityID"] = [names[id_] for id_ in log["ActivityID"]]
+        log["ActivityLabel"] = [
+            {key: names.get(value, value) for key, value in label.items()}
+            for label in log["ActivityLabel"]
+        ]
+        logs.append(log)
+    return env, while_activity, hopper, logs
+
+
+def test_fast_forward():
+    """Test that the steady cycles are skipped with the same results."""
+    env, while_activity, hopper, logs = run_single_run(fast_forward=True)
+    expected_env, _, expected_hopper, expected_logs = run_single_run(False)
+
+    # the first cycles and the last cycle are simulated
+    assert 40 < while_activity.steady_cycles.skipped < 50
+    assert env.now == pytest.approx(expected_env.now)
+    assert logs == expected_logs
+    assert np.allclose(hopper.trips.times, expected_hopper.trips.times)
+    assert np.allclose(hopper.trips.coordinates, expected_hopper.trips.coordinates)
+
+
+def test_fast_forward_competitor():
+    """Test that no cycles are skipped over an event at the same time."""
+    env, while_activity, _, logs = run_single_run(True, competitor=True)
+    expected_env, _, _, expected_logs = run_single_run(False, competitor=True)
+
+    assert while_activity.steady_cycles.skipped > 0
+    assert env.now == pytest.approx(expected_env.now)
+    assert logs == expected_logs
+
+
+def test_safe_cycles():
+    """Test the number of cycles before a level event would be triggered."""
+    # the level reaches 80 + 10 (within the cycle) after 1 cycle
+    assert _safe_cycles(70, 10, 10, "ge", [100]) == 1
+    assert _safe_cycles(70, 10, 10, "gt", [100]) == 2
+    assert _safe_cycles(70, -10, 10, "ge", [100]) == np.inf
+    assert _safe_cycles(30, -10, 10, "le", [0]) == 1
+    assert _safe_cycles(5, -10, 10, "lt", [0]) == 0
@@ -0,0 +1,70 @@
+"""Test module for the log verbosity levels."""
+
+import pytest
+import simpy
+
+from openclsim import core, model, plot
+
+from .conftest import demo_data
+
+
+def get_environment(log_level):
+    """Return an environment class with the given log_level."""
+    return type("Environment", (simpy.Environment,), {"log_level": log_level})
+
+
+def get_entries(simulation):
+    objects = simulation["object_list"]
+    activities = model.get_subprocesses(simulation["activity_list"])
+    return {obj: list(obj.logbook) for obj in objects + activities}
+
+
+@pytest.mark.parametrize("log_level", ["none", "top", "base"])
+def test_log_level(log_level):
+    """Test that the entries above the log_level are skipped."""
+    full = get_entries(demo_data(nr_barges=2, total_amount=100))
+    simulation = demo_data(
+        nr_barges=2, total_amount=100, env=get_environment(log_level)
+    )
+    entries = get_entries(simulation)
+
+    top_level = set(simulation["activity_list"])
+    for (obj, obj_entries), full_entries in zip(entries.items(), full.values()):
+        if log_level == "none" or (log_level == "top" and obj not in top_level):
+            expected = []
+        else:
+            expected = [
+                entry
+                for entry in full_entries
+                if "WAIT" not in entry["ActivityState"]
+                and entry["ActivityLabel"].get("type") != "subprocess"
+            ]
+        assert [(e["Timestamp"], e["ActivityState"]) for e in obj_entries] == [
+            (e["Timestamp"], e["ActivityState"]) for e in expected
+        ]
+
+
+def test_log_level_per_object():
+    """Test the log_level of a single object and the level required by a plot."""
+    env = simpy.Environment()
+    env.log_level = "none"
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    site = Site(env=env, name="site", capacity=10)
+    site_full = Site(env=env, name="site full", capacity=10, log_level="full")
+    assert site.log_level == core.LogLevel.NONE
+
+    for obj in [site, site_full]:
+        obj.log_entry_v1(0, "activity", core.LogState.START)
+        obj.log_entry_v1(0, "activity", core.LogState.WAIT_START)
+    assert len(site.logbook) == 0
+    assert len(site_full.logbook) == 2
+
+    site.log_level = core.LogLevel.BASE
+    site.log_entry_v1(1, "activity", core.LogState.STOP)
+    site.log_entry_v1(1, "activity", core.LogState.WAIT_STOP)
+    assert site.log["ActivityState"] == ["STOP"]
+
+    with pytest.raises(ValueError, match="log_level BASE"):
+        plot.get_step_chart([Site(env=env, name="other", capacity=10)])
+    with pytest.raises(AssertionError):
+        Site(env=env, name="wrong", capacity=10, log_level="verbose")
@@ -0,0 +1,84 @@
+"""Test module for streaming the log to a file."""
+
+import json
+
+import pandas as pd
+import pytest
+import simpy
+
+import openclsim.model as model
+from openclsim import core
+
+pytest.importorskip("pyarrow")
+
+
+def run_basic_activities(env):
+    registry = {}
+    reporting_activity = model.BasicActivity(
+        env=env,
+        name="Reporting activity",
+        registry=registry,
+        duration=0,
+    )
+    activities = [
+        model.BasicActivity(
+            env=env,
+            name=f"Basic activity {i}",
+            registry=registry,
+            duration=10 * (i + 1),
+            additional_logs=[reporting_activity],
+        )
+        for i in range(3)
+    ]
+    model.register_processes(activities)
+    env.run()
+    return reporting_activity, activities
+
+
+@pytest.mark.parametrize(
+    "sink_class, read",
+    [
+        (core.ParquetLogSink, pd.read_parquet),
+        (core.ArrowLogSink, pd.read_feather),
+    ],
+)
+def test_log_sink(tmp_path, sink_class, read):
+    """Test that all entries are written in batches to the file."""
+    env = simpy.Environment()
+    path = tmp_path / "log"
+    with sink_class(path, batch_size=4) as sink:
+        env.log_sink = sink
+        reporting_activity, activities = run_basic_activities(env)
+        # only the last (incomplete) batch is kept in memory
+        assert len(sink._buffer["Timestamp"]) < 4
+
+    df = read(path)
+    assert len(df) == sink.nr_entries == 12
+    assert list(df.columns) == core.LogSink.columns
+    assert set(df.Object) == {"Reporting activity"} | {a.name for a in activities}
+    assert df.Timestamp.max() == pd.Timestamp("1970-01-01 00:00:30")
+
+    labels = [json.loads(label) for label in df.ActivityLabel]
+    assert {"type": "additional log", "ref": activities[0].id} in labels
+
+    with pytest.raises(RuntimeError):
+        reporting_activity.log
+
+
+def test_log_sink_keep_in_memory(tmp_path):
+    """Test that the log is still available with keep_in_memory."""
+    env = simpy.Environment()
+    sink = core.ParquetLogSink(tmp_path / "log.parquet", keep_in_memory=True)
+    env.log_sink = sink
+    reporting_activity, _ = run_basic_activities(env)
+
+    df = sink.read()
+    assert len(df) == 12
+    assert len(reporting_activity.log["Timestamp"]) == 6
+
+
+def test_log_sink_abstract(tmp_path):
+    """Test that a sink without writer can not be created."""
+    IncompleteSink = type("IncompleteSink", (core.LogSink,), {})
+    with pytest.raises(TypeError):
+        IncompleteSink(tmp_path / "log.parquet")
@@ -0,0 +1,248 @@
+"""Test module for the columnar log store."""
+
+import datetime
+
+import pandas as pd
+import shapely.geometry
+import simpy
+
+from openclsim import core
+from openclsim.plot.log_dataframe import get_log_dataframe, replace_ids
+
+
+def get_site(env):
+    Site = type(
+        "Site",
+        (core.Identifiable, core.Log, core.Locatable, core.HasContainer),
+        {},
+    )
+    return Site(
+        env=env,
+        name="site",
+        geometry=shapely.geometry.Point(4.18, 52.18),
+        capacity=10,
+        level=5,
+    )
+
+
+def test_log_columns():
+    """Test the log property built from the columns."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    site.container.put(2)
+    site.log_entry_v1(
+        10.5,
+        "activity",
+        core.LogState.STOP,
+        activity_label={"type": "subprocess", "ref": "sub"},
+    )
+
+    log = site.log
+    assert log["Timestamp"] == [
+        datetime.datetime(1970, 1, 1),
+        datetime.datetime(1970, 1, 1, 0, 0, 10, 500000),
+    ]
+    assert log["ActivityID"] == ["activity", "activity"]
+    assert log["ActivityState"] == ["START", "STOP"]
+    assert [state["container level"] for state in log["ObjectState"]] == [5, 7]
+    assert log["ObjectState"][0]["geometry"].equals(site.geometry)
+    assert log["ActivityLabel"] == [{}, {"type": "subprocess", "ref": "sub"}]
+
+    # the values keep their type
+    assert isinstance(log["ObjectState"][0]["container level"], int)
+
+
+def test_logbook_view():
+    """Test the record oriented view on the log."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    site.log_entry_v1(3, "activity", core.LogState.STOP)
+
+    assert len(site.logbook) == 2
+    assert site.logbook[-1]["ActivityState"] == "STOP"
+    assert site.logbook[-1]["Timestamp"] == datetime.datetime(1970, 1, 1, 0, 0, 3)
+    assert [entry["ObjectState"]["container level"] for entry in site.logbook] == [
+        5,
+        5,
+    ]
+
+
+def test_logbook_records():
+    """Test that records in another format are kept as is."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    site.log_entry_v0("message", 1, 3, site.geometry)
+    site.logbook.append({"Timestamp": datetime.datetime(1970, 1, 1), "Value": 1})
+
+    assert len(site.logbook) == 3
+    assert site.logbook[1]["Message"] == "message"
+    assert site.logbook[2]["Value"] == 1
+    assert len(site.log["Timestamp"]) == 3
+
+    site.logbook = []
+    assert len(site.logbook) == 0
+    assert site.log["Timestamp"] == []
+
+
+def test_logbook_list_methods():
+    """Test the list methods of the logbook (earlier versions used a list)."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    site.log_entry_v1(3, "activity", core.LogState.STOP)
+    record = {"Timestamp": datetime.datetime(1970, 1, 1), "Value": 1}
+
+    logbook = site.logbook
+    logbook.extend([record, record])
+    assert len(site.logbook) == 4
+
+    logbook[0] = {**record, "Value": 0}
+    del logbook[1]
+    assert [entry.get("Value") for entry in site.logbook] == [0, 1, 1]
+    assert len(logbook) == 3
+
+    logbook.clear()
+    assert len(site.logbook) == 0
+    assert site.log["Timestamp"] == []
+
+
+def test_to_datetime64():
+    """Test the vectorized conversion of the float timestamps."""
+    timestamps = [0, 1e-7, 0.9999995, 10.5000005, -1.5, 1.5e9 + 0.4999995]
+    expected = [datetime.datetime.utcfromtimestamp(t) for t in timestamps]
+    assert core.log_store.to_datetime64(timestamps).tolist() == expected
+
+
+def test_delta_state_logging():
+    """Test that delta encoded states are rebuilt to the full ObjectState."""
+    logs = {}
+    for state_logging in ["full", "delta"]:
+        env = simpy.Environment()
+        env.state_logging = state_logging
+        site = get_site(env)
+
+        site.log_entry_v1(0, "activity", core.LogState.START)
+        site.log_entry_v1(1, "activity", core.LogState.STOP, {"extra": 1})
+        # the cached log is extended from here on
+        assert len(site.log["ObjectState"]) == 2
+        site.container.put(2)
+        site.log_entry_v1(2, "activity", core.LogState.START)
+        site.log_entry_v1(3, "activity", core.LogState.STOP, {"extra": 1.0})
+        site.log_entry_v1(4, "activity", core.LogState.START)
+        logs[state_logging] = site
+
+    full, delta = logs["full"], logs["delta"]
+    assert delta.log == full.log
+    assert list(delta.logbook) == list(full.logbook)
+    assert [delta.logbook[i] for i in range(5)] == list(full.logbook)
+    assert [type(state.get("extra")) for state in delta.log["ObjectState"]] == [
+        type(None),
+        int,
+        type(None),
+        float,
+        type(None),
+    ]
+
+    # only the changes are stored
+    columns = delta._log_store._state_columns
+    assert columns["container level"].size == 2
+    assert columns["geometry"].size == 1
+
+
+def test_log_cache():
+    """Test that the log is extended incrementally and returned as a copy."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    log = site.log
+    assert site.log == log
+
+    # changing the returned log does not change the log of the site
+    log["ActivityID"].append("other")
+    log["ObjectState"][0]["container level"] = 0
+    assert site.log["ActivityID"] == ["activity"]
+    assert site.log["ObjectState"][0]["container level"] == 5
+
+    site.container.put(2)
+    site.log_entry_v1(1, "activity", core.LogState.STOP)
+    assert site._log_cache[1] == 1
+    assert site.log["ActivityState"] == ["START", "STOP"]
+    assert [state["container level"] for state in site.log["ObjectState"]] == [5, 7]
+    assert site._log_cache[1] == 2
+
+    # a new logbook starts a new cache
+    site.logbook = []
+    assert site.log["ActivityID"] == []
+
+
+def test_id_table():
+    """Test that the activity ids of all objects share the table of the env."""
+    env = simpy.Environment()
+    site = get_site(env)
+    other = get_site(env)
+
+    site.log_entry_v1(0, "a", core.LogState.START)
+    other.log_entry_v1(0, "b", core.LogState.START)
+    other.log_entry_v1(1, "a", core.LogState.STOP)
+
+    table = core.get_id_table(env)
+    assert table is env.id_table
+    assert table.ids == ["a", "b"]
+    assert other._log_store.get_activity_codes().tolist() == [1, 0]
+    assert other.log["ActivityID"] == ["b", "a"]
+    assert core.get_id_table(simpy.Environment()) is not table
+
+
+def test_replace_ids():
+    """Test that replace_ids gives the same result as pandas replace."""
+    ids = pd.Series(["a", "b", None, "a"], name="Activity")
+    id_map = {"a": "name a", "c": "name c"}
+    assert replace_ids(ids, id_map).equals(ids.replace(id_map))
+    assert replace_ids(pd.Series([1, 2]), {3: "c"}).equals(pd.Series([1, 2]))
+
+
+def test_log_dataframe_order():
+    """Test that entries with the same timestamp keep the order of logging."""
+    env = simpy.Environment()
+    site = get_site(env)
+
+    entries = [
+        (0, "a", core.LogState.START),
+        (20, "a", core.LogState.STOP),
+        (20, "b", core.LogState.START),
+        (20, "c", core.LogState.START),
+        (20, "b", core.LogState.STOP),
+        (10, "d", core.LogState.WAIT_START),
+        (20, "c", core.LogState.STOP),
+        (20, "d", core.LogState.WAIT_STOP),
+    ]
+    for t, activity, state in entries:
+        site.log_entry_v1(t, activity, state)
+
+    df = get_log_dataframe(site, {"a": "A"})
+    assert list(zip(df["Activity"], df["ActivityState"])) == [
+        ("A", "START"),
+        ("d", "WAIT_START"),
+        ("A", "STOP"),
+        ("b", "START"),
+        ("c", "START"),
+        ("b", "STOP"),
+        ("c", "STOP"),
+        ("d", "WAIT_STOP"),
+    ]
+
+    # many entries with the same timestamps
+    for i in range(100):
+        site.log_entry_v1(30 + i % 3, f"activity {i}", core.LogState.START)
+    df = get_log_dataframe(site)
+    assert list(df["Activity"][8:]) == [
+        f"activity {i}" for i in sorted(range(100), key=lambda i: i % 3)
+    ]
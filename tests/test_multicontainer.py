@@ -1,5 +1,6 @@
 """Test package."""
 
+import pytest
 import shapely.geometry
 import simpy
 
@@ -95,3 +96,302 @@ def test_mulitcontainer():
     assert_log(hopper)
     assert_log(activity)
     assert_log(from_site)
+
+
+def test_multicontainer_bulk():
+    """Test the bulk operations of the array backed multicontainer."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasMultiContainer), {})
+    ids = [f"soil {i}" for i in range(50)]
+    site = Site(
+        env=env,
+        name="site",
+        initials=[{"id": id_, "level": 10, "capacity": 20} for id_ in ids],
+    )
+    barge = Site(
+        env=env,
+        name="barge",
+        initials=[{"id": id_, "level": 0, "capacity": 2} for id_ in reversed(ids)],
+    )
+
+    assert site.container.container_list == ids
+    assert site.container.get_fill_degree() == 0.5
+    assert site.container.get_level("soil 3_reservations") == 10
+
+    amounts = [1.0] * 50
+    site.container.transfer(barge.container, amounts, ids)
+    assert site.container.get_level("soil 0") == 9
+    assert barge.container.get_levels(["soil 0", "soil 49"]).tolist() == [1, 1]
+    assert barge.container.get_fill_degree() == 0.5
+    assert barge.get_state()["container level"]["soil 7"] == 1
+
+    # the states do not share the cached levels
+    state = barge.get_state()
+    state["container level"]["soil 7"] = 100
+    assert barge.get_state()["container level"]["soil 7"] == 1
+
+    # level events of the containers are triggered by the bulk operations
+    full = barge.container.get_full_event("soil 7")
+    snapshot = barge.container.get_levels()
+    barge.container.change_levels([1], ["soil 7"])
+    assert full.triggered
+    assert snapshot.sum() == 50
+    assert barge.container.get_levels().sum() == 51
+
+    barge.container.change_levels(-snapshot, reservations=True)
+    assert barge.container.get_level("soil 7_reservations") == -1
+    assert barge.container.items[:2] == [
+        {"id": "soil 49", "capacity": 2, "level": 1},
+        {"id": "soil 49_reservations", "capacity": 2, "level": -1},
+    ]
+
+
+def test_multicontainer_int_levels():
+    """Test that integer levels are returned and logged as integers."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasMultiContainer), {})
+    site = Site(
+        env=env,
+        name="site",
+        initials=[
+            {"id": "MP", "level": 2, "capacity": 10},
+            {"id": "TP", "level": 0.5, "capacity": 2},
+        ],
+    )
+    barge = Site(
+        env=env,
+        name="barge",
+        initials=[
+            {"id": "MP", "level": 0, "capacity": 10},
+            {"id": "TP", "level": 0, "capacity": 2},
+        ],
+    )
+
+    levels = site.get_state()["container level"]
+    assert levels == {"MP": 2, "TP": 0.5}
+    assert type(levels["MP"]) is int and type(levels["TP"]) is float
+    assert type(site.container.get_capacity("MP")) is int
+
+    site.container.transfer(barge.container, {"MP": 1}, reserved_amounts={"MP": 1})
+    assert type(barge.container.get_level("MP")) is int
+    assert type(barge.container.get_level("MP_reservations")) is int
+
+    # a fractional amount makes the level a float, like a python number
+    barge.container.change_levels([0.5], ["MP"])
+    assert type(barge.container.get_level("MP")) is float
+    assert type(barge.container.get_level("TP")) is int
+    assert barge.container.items[0] == {"id": "MP", "capacity": 10, "level": 1.5}
+
+
+def test_multicontainer_log_levels():
+    """Test that changing the read log does not change the logged levels."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasMultiContainer), {})
+    site = Site(
+        env=env,
+        name="site",
+        initials=[{"id": "MP", "level": 2, "capacity": 10}],
+    )
+    site.log_entry_v1(0, "activity", core.LogState.START)
+    site.log_entry_v1(1, "activity", core.LogState.STOP)
+
+    state = site.get_state()
+    state["container level"]["MP"] = 100
+    site.log["ObjectState"][0]["container level"]["MP"] = 100
+    site.logbook[1]["ObjectState"]["container level"]["MP"] = 100
+
+    assert [state["container level"] for state in site.log["ObjectState"]] == [
+        {"MP": 2},
+        {"MP": 2},
+    ]
+    assert site.get_state()["container level"] == {"MP": 2}
+
+
+def test_multicontainer_speed():
+    """Test the speed of a partly filled multi container vessel."""
+    env = simpy.Environment()
+    Vessel = type(
+        "Vessel",
+        (core.MultiContainerDependentMovable, core.Identifiable, core.Log),
+        {},
+    )
+    vessel = Vessel(
+        env=env,
+        name="vessel",
+        geometry=shapely.geometry.Point(4.18, 52.18),
+        compute_v=lambda x: 10 + 6 * x,
+        initials=[
+            {"id": "MP", "level": 2, "capacity": 10},
+            {"id": "TP", "level": 0, "capacity": 2},
+        ],
+    )
+    # the fill degree is the total level (2) over the total capacity (12)
+    assert vessel.v == 11
+
+    vessel.container.change_levels([8, 2], ["MP", "TP"])
+    assert vessel.v == 16
+
+
+def test_shift_amount_bundle():
+    """Test shifting a bundle of several containers in one atomic transfer."""
+    env = simpy.Environment()
+    location = shapely.geometry.Point(4.18055556, 52.18664444)
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasMultiContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    Hopper = type(
+        "Hopper",
+        (
+            core.MultiContainerDependentMovable,
+            core.Processor,
+            core.HasResource,
+            core.LoadingFunction,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+    site = Site(
+        env=env,
+        name="site",
+        geometry=location,
+        initials=[
+            {"id": "MP", "level": 2, "capacity": 10},
+            {"id": "TP", "level": 2, "capacity": 10},
+        ],
+    )
+    hopper = Hopper(
+        env=env,
+        name="hopper",
+        geometry=location,
+        loading_rate=1,
+        compute_v=lambda x: 10,
+        initials=[
+            {"id": "MP", "level": 0, "capacity": 2},
+            {"id": "TP", "level": 0, "capacity": 2},
+        ],
+    )
+
+    # the transfer is atomic: nothing changes if a part is not available
+    with pytest.raises(ValueError, match="cannot be transferred"):
+        site.container.transfer(hopper.container, {"MP": 1, "TP": 3})
+    assert site.container.get_levels().tolist() == [2, 2]
+    assert not site.container.can_transfer(hopper.container, {"MP": 1, "TP": 3})
+
+    activity = model.ShiftAmountActivity(
+        env=env,
+        name="Transfer bundle",
+        registry={},
+        processor=hopper,
+        origin=site,
+        destination=hopper,
+        amount={"MP": 1, "TP": 2},
+        phase="loading",
+    )
+    model.register_processes([activity])
+    env.run()
+
+    # the duration is determined for the total amount
+    assert env.now == 3
+    assert hopper.container.get_levels(["MP", "TP"]).tolist() == [1, 2]
+    assert site.container.get_levels(["MP", "TP"]).tolist() == [1, 0]
+    assert hopper.container.get_levels(reservations=True).tolist() == [1, 2]
+    assert site.container.get_levels(reservations=True).tolist() == [1, 0]
+    assert activity.log["ActivityState"] == ["START", "STOP"]
+    assert hopper.log["ActivityState"] == ["START", "STOP"]
+
+
+def test_shift_amount_bundle_partly_exhausted():
+    """Test a bundle of which some containers are empty (origin) or full."""
+    env = simpy.Environment()
+    location = shapely.geometry.Point(4.18055556, 52.18664444)
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasMultiContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    Hopper = type(
+        "Hopper",
+        (
+            core.MultiContainerDependentMovable,
+            core.Processor,
+            core.HasResource,
+            core.LoadingFunction,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+    site = Site(
+        env=env,
+        name="site",
+        geometry=location,
+        initials=[
+            {"id": "MP", "level": 0, "capacity": 10},
+            {"id": "TP", "level": 2, "capacity": 10},
+            {"id": "SP", "level": 3, "capacity": 10},
+        ],
+    )
+    hopper = Hopper(
+        env=env,
+        name="hopper",
+        geometry=location,
+        loading_rate=1,
+        compute_v=lambda x: 10,
+        initials=[
+            {"id": "MP", "level": 0, "capacity": 2},
+            {"id": "TP", "level": 0, "capacity": 2},
+            {"id": "SP", "level": 2, "capacity": 2},
+        ],
+    )
+
+    activity = model.ShiftAmountActivity(
+        env=env,
+        name="Transfer bundle",
+        registry={},
+        processor=hopper,
+        origin=site,
+        destination=hopper,
+        amount={"MP": 1, "TP": 2, "SP": 1},
+        phase="loading",
+    )
+    model.register_processes([activity])
+    env.run()
+
+    # MP is empty in the origin and SP is full in the destination, only TP moves
+    assert env.now == 2
+    assert hopper.container.get_levels(["MP", "TP", "SP"]).tolist() == [0, 2, 2]
+    assert site.container.get_levels(["MP", "TP", "SP"]).tolist() == [0, 0, 3]
+    assert hopper.container.get_levels(reservations=True).tolist() == [0, 2, 2]
+    assert site.container.get_levels(reservations=True).tolist() == [0, 0, 3]
+
+    # the shift is skipped when nothing of the bundle can be shifted
+    exhausted = model.ShiftAmountActivity(
+        env=env,
+        name="Transfer exhausted bundle",
+        registry={},
+        processor=hopper,
+        origin=site,
+        destination=hopper,
+        amount={"MP": 1, "SP": 1},
+        phase="loading",
+    )
+    model.register_processes([exhausted])
+    env.run()
+    assert env.now == 2
+    assert hopper.container.get_levels(reservations=True).tolist() == [0, 2, 2]
+    assert site.container.get_levels(reservations=True).tolist() == [0, 0, 3]
@@ -57,3 +57,41 @@ def test_parallel():
     assert env.now == 220
     assert_log(activity)
     assert_log(reporting_activity)
+
+
+def test_parallel_many():
+    """Test that every sub process is logged when it is done."""
+    env = simpy.Environment()
+    registry = {}
+    sub_processes = [
+        model.BasicActivity(
+            env=env,
+            name=f"Basic activity{i}",
+            registry=registry,
+            duration=(i * 37) % 200,
+        )
+        for i in range(200)
+    ]
+    activity = model.ParallelActivity(
+        env=env,
+        name="Parallel process",
+        registry=registry,
+        sub_processes=sub_processes,
+    )
+    model.register_processes([activity])
+    env.run()
+
+    assert env.now == 199
+    stops = [
+        (timestamp.timestamp(), label["ref"])
+        for timestamp, state, label in zip(
+            activity.log["Timestamp"],
+            activity.log["ActivityState"],
+            activity.log["ActivityLabel"],
+        )
+        if state == "STOP" and label
+    ]
+    assert len(stops) == 200
+    durations = {sub_process.id: sub_process.duration for sub_process in sub_processes}
+    assert all(time == durations[ref] for time, ref in stops)
+    assert [time for time, _ in stops] == sorted(time for time, _ in stops)
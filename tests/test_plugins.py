@@ -0,0 +1,65 @@
+"""Test module for the plugin mechanism of the activities."""
+
+import simpy
+
+import openclsim.model as model
+
+
+class RecordingPlugin(model.AbstractPluginClass):
+    """Plugin that records its calls and waits wait seconds before the activity."""
+
+    def __init__(self, name, calls, wait=0, synchronous=False):
+        self.name = name
+        self.calls = calls
+        self.wait = wait
+        self.synchronous = synchronous
+
+    def pre_process(self, env, activity_log, activity, *args, **kwargs):
+        self.calls.append((self.name, "pre", env.now))
+        if self.wait:
+            return activity.delay_processing(
+                env, {"type": "plugin", "ref": self.name}, activity_log, self.wait
+            )
+        return {}
+
+    def post_process(self, env, activity_log, activity, *args, **kwargs):
+        self.calls.append((self.name, "post", env.now))
+        return {}
+
+
+def test_plugins():
+    """Test that the plugins are called in the order of their priority."""
+    env = simpy.Environment()
+    activity = model.BasicActivity(env=env, name="activity", registry={}, duration=10)
+    assert activity.pre_process({}) == ()
+
+    calls = []
+    activity.register_plugin(RecordingPlugin("c", calls, synchronous=True), 3)
+    activity.register_plugin(RecordingPlugin("a", calls, wait=5), 1)
+    activity.register_plugin(RecordingPlugin("b", calls, synchronous=True), 1)
+    assert [item["plugin"].name for item in activity.plugins] == ["a", "b", "c"]
+
+    model.register_processes([activity])
+    env.run()
+
+    assert env.now == 15
+    assert calls == [
+        ("a", "pre", 0),
+        ("b", "pre", 5),
+        ("c", "pre", 5),
+        ("a", "post", 15),
+        ("b", "post", 15),
+        ("c", "post", 15),
+    ]
+
+
+def test_synchronous_plugins():
+    """Test that synchronous plugins are called without a generator."""
+    env = simpy.Environment()
+    activity = model.BasicActivity(env=env, name="activity", registry={}, duration=10)
+    calls = []
+    activity.register_plugin(RecordingPlugin("a", calls, synchronous=True))
+
+    args_data = {"env": env, "activity_log": activity, "activity": activity}
+    assert activity.pre_process(args_data) == ()
+    assert calls == [("a", "pre", 0)]
@@ -0,0 +1,51 @@
+"""Test module for the registration of the processes."""
+
+import pytest
+import simpy
+
+import openclsim.model as model
+
+
+def done(name):
+    return {"type": "activity", "state": "done", "name": name}
+
+
+def test_register_order():
+    """Test that activities are registered after the activities they wait for."""
+    env = simpy.Environment()
+    registry = {}
+    activities = [
+        model.BasicActivity(
+            env=env,
+            name=f"activity {i}",
+            registry=registry,
+            duration=1,
+            start_event=done(f"activity {i + 1}") if i < 999 else None,
+        )
+        for i in range(1000)
+    ]
+    model.register_processes(activities)
+    # the registry is filled in the order of registration
+    assert list(registry["name"])[:2] == ["activity 999", "activity 998"]
+    env.run()
+
+    assert env.now == 1000
+    assert activities[0].log["Timestamp"][-1].timestamp() == 1000
+
+
+def test_register_cycle():
+    """Test that a cycle in the start events is reported."""
+    env = simpy.Environment()
+    registry = {}
+    sub_processes = [
+        model.BasicActivity(env=env, name="first", registry=registry, duration=1),
+        model.BasicActivity(env=env, name="second", registry=registry, duration=1),
+    ]
+    # the first sub process can only start when the second is done
+    sub_processes[0].start_event = done("second")
+    sequence = model.SequentialActivity(
+        env=env, name="sequence", registry=registry, sub_processes=sub_processes
+    )
+
+    with pytest.raises(ValueError, match="first \\(start\\) -> second \\(done\\)"):
+        model.register_processes([sequence])
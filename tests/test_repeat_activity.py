@@ -33,3 +33,40 @@ def test_repeat_activity():
 
     assert my_env.now == 42
     assert_log(repeat_activity)
+
+
+def test_reuse_processes():
+    """Test that the sub processes are run again in the same simpy process."""
+
+    def run(reuse_processes):
+        env = simpy.Environment()
+        env.reuse_processes = reuse_processes
+        registry = {}
+        sub_processes = [
+            model.BasicActivity(
+                env=env, name=f"Basic activity{i}", registry=registry, duration=i + 1
+            )
+            for i in range(2)
+        ]
+        sequence = model.SequentialActivity(
+            env=env, name="sequence", registry=registry, sub_processes=sub_processes
+        )
+        repeat_activity = model.RepeatActivity(
+            env=env,
+            name="repeat",
+            registry=registry,
+            sub_processes=[sequence],
+            repetitions=10,
+        )
+        model.register_processes([repeat_activity])
+        env.run()
+        assert env.now == 30
+        return [sequence, *sub_processes]
+
+    activities = run(reuse_processes=True)
+    runners = [activity._runner for activity in activities]
+    assert all(runner is not None and runner.is_alive for runner in runners)
+
+    for activity, expected in zip(activities, run(reuse_processes=False)):
+        assert activity.log["Timestamp"] == expected.log["Timestamp"]
+        assert activity.log["ActivityState"] == expected.log["ActivityState"]
@@ -0,0 +1,72 @@
+"""Test module for routing over the graph of the environment."""
+
+import networkx as nx
+import pytest
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+
+def get_graph():
+    """Return a graph A - B - C with a detour A - D - C."""
+    graph = nx.Graph()
+    points = {"A": (4.0, 52.0), "B": (4.1, 52.0), "C": (4.2, 52.0), "D": (4.1, 52.3)}
+    for node, point in points.items():
+        graph.add_node(node, geometry=shapely.geometry.Point(*point))
+    for a, b in [("A", "B"), ("C", "B"), ("A", "D"), ("D", "C")]:
+        geometry = shapely.geometry.LineString([points[a], points[b]])
+        graph.add_edge(a, b, geometry=geometry)
+    return graph
+
+
+@pytest.mark.parametrize("pass_edges", [False, True])
+def test_routable(pass_edges):
+    """Test that a Routable sails over the shortest path of env.FG."""
+    env = simpy.Environment()
+    env.FG = get_graph()
+    nodes = env.FG.nodes
+
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Vessel = type(
+        "Vessel", (core.Identifiable, core.Routable, core.HasResource, core.Log), {}
+    )
+    site = Site(env=env, name="site", geometry=nodes["C"]["geometry"], node="C")
+    vessel = Vessel(
+        env=env, name="vessel", geometry=nodes["A"]["geometry"], node="A", v=5
+    )
+    passed = []
+    if pass_edges:
+        vessel.on_pass_edge_functions.append(
+            lambda movable, a, b, route, geometry: env.timeout(
+                0, passed.append((a, b, geometry.coords[0]))
+            )
+        )
+
+    activity = model.MoveActivity(
+        env=env, name="sail", registry={}, mover=vessel, destination=site
+    )
+    model.register_processes([activity])
+    env.run()
+
+    network = core.get_route_network(env)
+    assert vessel.route == ["A", "B", "C"]
+    assert vessel.node == "C"
+    assert vessel.geometry.equals(site.geometry)
+    assert env.now == pytest.approx(network.route_length(["A", "B", "C"]) / 5)
+    assert network.route_length(["A", "B", "C"]) == pytest.approx(
+        core.compute_distance(nodes["A"]["geometry"], nodes["C"]["geometry"]),
+    )
+    assert vessel.log["ActivityState"] == ["START", "STOP"]
+    # the edges are recorded as trips
+    assert len(vessel.trips) == 2
+    halfway = vessel.position_at(env.now / 2)
+    assert core.compute_distance(halfway, nodes["B"]["geometry"]) < 1e-3
+
+    if pass_edges:
+        # the edge from C to B is oriented in the direction of travel
+        assert passed == [("A", "B", (4.0, 52.0)), ("B", "C", (4.1, 52.0))]
+    # the cached paths are not changed by the callers
+    network.shortest_path("A", "C").append("D")
+    assert network.shortest_path("A", "C") == ["A", "B", "C"]
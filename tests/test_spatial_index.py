@@ -0,0 +1,56 @@
+"""Test module for the spatial index of the environment."""
+
+import numpy as np
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+
+
+def test_spatial_index():
+    """Test the radius, nearest and is_at queries against a scan."""
+    env = simpy.Environment()
+    env.spatial_index = True
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    rng = np.random.default_rng(1)
+    points = rng.uniform([3.0, 51.0], [6.0, 54.0], size=(200, 2))
+    sites = [
+        Site(env=env, name=f"site {i}", geometry=shapely.geometry.Point(*point))
+        for i, point in enumerate(points)
+    ]
+    index = core.get_spatial_index(env)
+    assert len(index) == 200
+
+    center = shapely.geometry.Point(4.5, 52.5)
+    distances = [core.compute_distance(center, site.geometry) for site in sites]
+    order = np.argsort(distances)
+    within = [sites[i] for i in order if distances[i] <= 30_000]
+    assert index.query_radius(center, 30_000) == within
+    assert index.nearest(center) is sites[order[0]]
+    nearest = sites[order[0]]
+    assert index.nearest(center, where=lambda obj: obj is not nearest) is (
+        sites[order[1]]
+    )
+    assert index.at(sites[3].geometry) == [sites[3]]
+
+    # the index is updated when an object moves, without rebuilding the tree
+    tree = index._tree
+    sites[3].geometry = center
+    assert index.nearest(center) is sites[3]
+    assert index.at(center) == [sites[3]]
+    sites[3].geometry = sites[4].geometry
+    assert index.at(center) == []
+    assert index.at(sites[4].geometry) == [sites[3], sites[4]]
+    distances = [core.compute_distance(center, site.geometry) for site in sites]
+    order = np.argsort(distances, kind="stable")
+    within = [sites[i] for i in order if distances[i] <= 30_000]
+    assert index.query_radius(center, 30_000) == within
+    assert index._tree is tree
+
+
+def test_spatial_index_disabled():
+    """Test that the objects are not indexed unless the index is enabled."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Site(env=env, name="site", geometry=shapely.geometry.Point(4.5, 52.5))
+    assert core.get_spatial_index(env) is None
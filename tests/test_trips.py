@@ -0,0 +1,82 @@
+"""Test module for the trip segments of the movables."""
+
+import numpy as np
+import pytest
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+
+def test_position_at():
+    """Test the positions along the trips of a movable, without geometry logs."""
+    env = simpy.Environment()
+    env.log_geometry = False
+    a = shapely.geometry.Point(4.18055556, 52.18664444)
+    b = shapely.geometry.Point(4.25222222, 52.11428333)
+
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Vessel = type("Vessel", (core.Identifiable, core.Movable, core.HasResource), {})
+    site_a = Site(env=env, name="a", geometry=a)
+    site_b = Site(env=env, name="b", geometry=b)
+    vessel = Vessel(env=env, name="vessel", geometry=a, v=10)
+
+    registry = {}
+    activities = [
+        model.MoveActivity(
+            env=env,
+            name=f"to {site.name}",
+            registry=registry,
+            mover=vessel,
+            destination=site,
+        )
+        for site in [site_b, site_a]
+    ]
+    sequence = model.SequentialActivity(
+        env=env, name="trip", registry=registry, sub_processes=activities
+    )
+    model.register_processes([sequence])
+    env.run()
+
+    distance = core.compute_distance(a, b)
+    assert env.now == pytest.approx(2 * distance / 10)
+    assert vessel.trips.times.tolist() == [[0, distance / 10], [distance / 10, env.now]]
+    assert "geometry" not in vessel.logbook[0]["ObjectState"]
+
+    assert vessel.position_at(-1).equals(a)
+    assert vessel.position_at(distance / 10).equals(b)
+    assert vessel.position_at(env.now + 1).equals(a)
+    # halfway the first trip, on the great circle from a to b
+    halfway = vessel.position_at(distance / 20)
+    assert core.compute_distance(a, halfway) == pytest.approx(distance / 2)
+    assert core.compute_distance(halfway, b) == pytest.approx(distance / 2)
+
+    times = np.linspace(-10, env.now + 10, 25)
+    positions = vessel.positions_at(times)
+    expected = [vessel.position_at(t).coords[0] for t in times]
+    np.testing.assert_allclose(positions, expected)
+
+
+def test_polygon_movable():
+    """Test a movable created with a polygon geometry."""
+    env = simpy.Environment()
+    area = shapely.geometry.box(4.17, 52.18, 4.19, 52.19)
+    b = shapely.geometry.Point(4.25222222, 52.11428333)
+
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Vessel = type("Vessel", (core.Identifiable, core.Movable, core.HasResource), {})
+    site_b = Site(env=env, name="b", geometry=b)
+    vessel = Vessel(env=env, name="vessel", geometry=area, v=10)
+    assert vessel.trips is None
+    assert vessel.position_at(0).equals(area.centroid)
+
+    # the distance from a polygon is not defined, move with a given duration
+    vessel.activity_id = "to b"
+    env.process(vessel.move(destination=site_b, duration=100))
+    env.run()
+
+    # the trip log starts at the centroid of the polygon
+    assert len(vessel.trips) == 1
+    assert vessel.position_at(0).equals(area.centroid)
+    assert vessel.position_at(env.now).equals(b)